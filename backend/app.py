@@ -4,17 +4,71 @@ OSR Assessment Tool - Flask Backend
 Complete version with all API endpoints for Railway deployment
 """
 
-from flask import Flask, jsonify, request
+from flask import Flask, Response, g, jsonify, request
+from flask.json.provider import JSONProvider
+from flask_compress import Compress
 from flask_cors import CORS
+import orjson
 import os
+import sys
 import logging
 import datetime
-import traceback
-from typing import Dict, Any
-from functools import wraps
+import itertools
+import threading
+import uuid
+from typing import Dict, Any, Optional, Tuple
+from dataclasses import dataclass
+from functools import lru_cache, wraps
+
+# Saved assessment response; the client payload is kept as sent
+@dataclass(slots=True)
+class ResponseRecord:
+    """A stored response together with the fields the server reads from it"""
+    payload: Dict[str, Any]
+    saved_timestamp: str
+    has_issues: Optional[str] = None
+
+    @classmethod
+    def from_payload(cls, payload: Dict[str, Any], saved_timestamp: str) -> 'ResponseRecord':
+        return cls(payload, saved_timestamp, payload.get('hasIssues'))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the response in the shape clients originally sent, plus saved_timestamp"""
+        return {**self.payload, 'saved_timestamp': self.saved_timestamp}
+
+# orjson options shared by every serializer in this module
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATACLASS
+
+def _orjson_default(obj: Any) -> Any:
+    """Serialize types orjson does not handle natively"""
+    if isinstance(obj, ResponseRecord):
+        return obj.to_dict()
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+# JSON provider backed by orjson, used by jsonify and request.get_json
+class ORJSONProvider(JSONProvider):
+    """Serialize and parse JSON with orjson instead of the stdlib json module"""
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return orjson.dumps(obj, default=_orjson_default, option=ORJSON_OPTIONS).decode()
+
+    def loads(self, s: Any, **kwargs: Any) -> Any:
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        obj = self._prepare_response_obj(args, kwargs)
+        return json_response(obj)
 
 # Create the Flask app
 app = Flask(__name__)
+app.json = ORJSONProvider(app)
+
+# Compress large responses (stored data dumps) for clients that accept it
+app.config.update(
+    COMPRESS_ALGORITHM=['br', 'gzip'],
+    COMPRESS_MIN_SIZE=512,
+)
+Compress(app)
 
 # Configure CORS to allow all origins
 CORS(app, resources={
@@ -38,8 +92,104 @@ logger = logging.getLogger(__name__)
 
 # In-memory storage for development (replace with database in production)
 # Structure: {store_id: {section_id: {question_id-procedure_index: response}}}
+# Object responses are stored as ResponseRecord, anything else as sent.
+# This state is process-local: the app must be served by a single worker
+# process (see Procfile) so every request sees the same data.
 responses_storage: Dict[str, Dict[str, Dict[str, Any]]] = {}
 
+# Shared read-only placeholder for missing stores/sections; never mutate it
+_EMPTY: Dict[str, Any] = {}
+
+# One lock per section serializes writers to that section and lets scoring
+# take a consistent snapshot of its counts; other sections are unaffected
+# Structure: {(store_id, section_id): lock}
+section_locks: Dict[Tuple[str, str], threading.Lock] = {}
+
+# Write counter per section, exposed as the ETag of the score endpoints
+# Structure: {(store_id, section_id): version}
+section_versions: Dict[Tuple[str, str], int] = {}
+
+# Write version per store, exposed as the ETag of the store score endpoint. Values
+# come from one process-wide counter (next() is atomic), so concurrent writers to
+# different sections of a store can never publish the same version twice, and any
+# write, including the one that creates the store, yields a new tag
+# Structure: {store_id: version}
+store_versions: Dict[str, int] = {}
+_store_version_counter = itertools.count(1)
+
+# Prefix for ETags so tags issued before a restart (when versions reset) never match
+_ETAG_PREFIX = uuid.uuid4().hex[:8]
+
+# Sections that make up the overall store score (interned so lookups with
+# request-supplied section IDs can match keys by identity)
+STORE_SECTIONS = tuple(sys.intern(section) for section in ('availability', 'checkout', 'fulfillment', 'people', 'culture'))
+STORE_SECTIONS_SET = frozenset(STORE_SECTIONS)
+
+# Standard max scores for each section
+STANDARD_SECTION_SCORES = {
+    'availability': 10,
+    'checkout': 10,
+    'fulfillment': 8,
+    'people': 10,
+    'culture': 8
+}
+
+# Fields every write request must provide
+SAVE_REQUIRED_FIELDS = frozenset({'store', 'section', 'question_id', 'procedure_index', 'response'})
+BATCH_REQUIRED_FIELDS = frozenset({'store', 'section', 'responses'})
+
+# Last computed section scores, dropped whenever the section is written to
+# Structure: {store_id: {section_id: section_score}}
+score_cache: Dict[str, Dict[str, Dict[str, Any]]] = {}
+
+# Number of responses with hasIssues == 'no', kept in step with responses_storage
+# Structure: {store_id: {section_id: count}}
+positive_counts: Dict[str, Dict[str, int]] = {}
+
+# Helper function to build a JSON response without going through jsonify
+def json_response(payload: Any, status: int = 200) -> Response:
+    """Serialize the payload straight to bytes and wrap it in a response"""
+    return app.response_class(
+        orjson.dumps(payload, default=_orjson_default, option=ORJSON_OPTIONS),
+        status=status,
+        mimetype='application/json'
+    )
+
+# Helper function to pre-serialize the fixed 400 bodies used by ID validation
+@lru_cache(maxsize=4)
+def _bad_request_body(error: str) -> bytes:
+    """Return the serialized 400 body for the given error message"""
+    return orjson.dumps({'success': False, 'error': error})
+
+def json_error(error: str) -> Response:
+    """Build a 400 response from a cached body"""
+    return app.response_class(_bad_request_body(error), status=400, mimetype='application/json')
+
+# Helper function to coerce and validate store and section IDs
+def validate_ids(store: Any, section: Any = None) -> Tuple[str, Optional[str], Optional[Response]]:
+    """Return (store_id, section_id, error_response); error_response is None when valid"""
+    store_id = str(store)
+    if not store_id or store_id == 'undefined':
+        return store_id, None, json_error('Invalid store ID')
+    
+    if section is None:
+        return store_id, None, None
+    
+    section_id = str(section)
+    if not section_id or section_id == 'undefined':
+        return store_id, section_id, json_error('Invalid section ID')
+    
+    if section_id in STORE_SECTIONS_SET:
+        section_id = sys.intern(section_id)
+    
+    return store_id, section_id, None
+
+# Stamp each request once so every timestamp in it matches
+@app.before_request
+def stamp_request() -> None:
+    """Compute the request timestamp once for all handlers to reuse"""
+    g.timestamp = datetime.datetime.utcnow().isoformat()
+
 # Error handling decorator
 def handle_errors(f):
     @wraps(f)
@@ -48,8 +198,7 @@ def handle_errors(f):
             return f(*args, **kwargs)
         except Exception as e:
             # Log the full exception with traceback
-            logger.error(f"Error in {f.__name__}: {str(e)}")
-            logger.error(traceback.format_exc())
+            logger.exception("Error in %s: %s", f.__name__, e)
             
             # Return a JSON error response
             return jsonify({
@@ -57,7 +206,7 @@ def handle_errors(f):
                 'error': 'Internal server error',
                 'message': str(e) if app.debug else 'An unexpected error occurred',
                 'endpoint': request.path,
-                'timestamp': datetime.datetime.utcnow().isoformat()
+                'timestamp': g.timestamp
             }), 500
     return decorated_function
 
@@ -69,61 +218,86 @@ def ensure_storage_structure(store_id: str, section_id: str) -> None:
     if section_id not in responses_storage[store_id]:
         responses_storage[store_id][section_id] = {}
 
+# Helper function to get the lock guarding a section
+def section_lock(store_id: str, section_id: str) -> threading.Lock:
+    """Return the lock for the given store and section, creating it if needed"""
+    key = (store_id, section_id)
+    lock = section_locks.get(key)
+    if lock is None:
+        # setdefault is atomic, so concurrent first writers share one lock
+        lock = section_locks.setdefault(key, threading.Lock())
+    return lock
+
+# Helper function to check whether a stored response counts towards the score
+def is_positive_response(response: Any) -> bool:
+    """Return True if the response reports no issues"""
+    return isinstance(response, ResponseRecord) and response.has_issues == 'no'
+
+# Helper function to store a response and keep the positive count up to date
+def store_response(store_id: str, section_id: str, response_key: str, response: Any) -> None:
+    """Save a response, adjusting the positive count; the caller holds section_lock"""
+    section_responses = responses_storage[store_id][section_id]
+    delta = is_positive_response(response) - is_positive_response(section_responses.get(response_key))
+    section_responses[response_key] = response
+    
+    if delta:
+        section_counts = positive_counts.setdefault(store_id, {})
+        section_counts[section_id] = section_counts.get(section_id, 0) + delta
+
+# Helper function to record that a section's responses changed
+def mark_section_changed(store_id: str, section_id: str) -> None:
+    """Bump the section and store versions and drop the section's cached score"""
+    key = (store_id, section_id)
+    section_versions[key] = section_versions.get(key, 0) + 1
+    store_versions[store_id] = next(_store_version_counter)
+    invalidate_section_score(store_id, section_id)
+
+# Helper functions to build ETags from section versions (sent as weak ETags
+# so Flask-Compress leaves them unchanged across content encodings)
+def section_etag(store_id: str, section_id: str) -> str:
+    """ETag for a single section score"""
+    return f"{_ETAG_PREFIX}-{section_versions.get((store_id, section_id), 0)}"
+
+def store_etag(store_id: str) -> str:
+    """ETag for a store score, changed by every write to any of its sections"""
+    return f"{_ETAG_PREFIX}-{store_versions.get(store_id, 0)}"
+
+# Helper function to answer conditional GETs
+def not_modified_response(etag: str) -> Optional[Response]:
+    """Return a 304 response if the client already has this ETag"""
+    if request.if_none_match.contains_weak(etag):
+        response = app.response_class(status=304)
+        response.set_etag(etag, weak=True)
+        return response
+    return None
+
+# Helper function to drop the cached score of a section after it changes
+def invalidate_section_score(store_id: str, section_id: str) -> None:
+    """Remove the cached score for the given store and section"""
+    score_cache.get(store_id, {}).pop(section_id, None)
+
 # Helper function to calculate section score
 def calculate_section_score(store_id: str, section_id: str) -> Dict[str, Any]:
-    """Calculate the score for a specific section"""
-    try:
-        if store_id not in responses_storage or section_id not in responses_storage[store_id]:
-            return {
-                'score': 0,
-                'max_score': 10,
-                'percentage': 0,
-                'color': 'red',
-                'questions_completed': 0,
-                'total_questions': 5,
-                'normalized': True
-            }
-        
-        section_responses = responses_storage[store_id][section_id]
-        
-        # Simple scoring logic (can be enhanced)
-        total_responses = len(section_responses)
-        positive_responses = sum(1 for resp in section_responses.values() 
-                               if isinstance(resp, dict) and resp.get('hasIssues') == 'no')
-        
-        # Calculate score (2 points per positive response)
-        score = positive_responses * 2
-        max_score = total_responses * 2 if total_responses > 0 else 10
-        
-        # Normalize scores to ensure consistent max points
-        standard_max_score = 10  # Standard max score for each section
-        normalization_factor = standard_max_score / max_score if max_score > 0 else 1
-        normalized_score = score * normalization_factor
-        
-        percentage = (normalized_score / standard_max_score * 100) if standard_max_score > 0 else 0
-        
-        # Determine color based on percentage
-        if percentage >= 80:
-            color = 'green'
-        elif percentage >= 60:
-            color = 'yellow'
-        else:
-            color = 'red'
-        
-        return {
-            'score': round(normalized_score, 1),
-            'raw_score': score,
-            'max_score': standard_max_score,
-            'raw_max_score': max_score,
-            'percentage': round(percentage, 1),
-            'color': color,
-            'questions_completed': total_responses,
-            'total_questions': max(total_responses, 5),
-            'normalized': True
-        }
-    except Exception as e:
-        logger.error(f"Error calculating section score: {e}")
-        logger.error(traceback.format_exc())
+    """Calculate the score for a specific section, reusing the cached value"""
+    cached_score = score_cache.get(store_id, _EMPTY).get(section_id)
+    if cached_score is not None:
+        return cached_score
+    
+    # Nothing stored yet: return the default score without caching it
+    if section_id not in responses_storage.get(store_id, _EMPTY):
+        return _compute_section_score(store_id, section_id)
+    
+    # Compute and cache under the section lock so a concurrent write cannot
+    # invalidate the entry between the two steps and leave a stale score
+    with section_lock(store_id, section_id):
+        section_score = _compute_section_score(store_id, section_id)
+        score_cache.setdefault(store_id, {})[section_id] = section_score
+    return section_score
+
+def _compute_section_score(store_id: str, section_id: str) -> Dict[str, Any]:
+    """Compute the score for a specific section from the stored responses"""
+    section_responses = responses_storage.get(store_id, _EMPTY).get(section_id)
+    if section_responses is None:
         return {
             'score': 0,
             'max_score': 10,
@@ -131,76 +305,49 @@ def calculate_section_score(store_id: str, section_id: str) -> Dict[str, Any]:
             'color': 'red',
             'questions_completed': 0,
             'total_questions': 5,
-            'normalized': True,
-            'error': str(e)
+            'normalized': True
         }
+    
+    # Simple scoring logic (can be enhanced)
+    total_responses = len(section_responses)
+    positive_responses = positive_counts.get(store_id, {}).get(section_id, 0)
+    
+    # Calculate score (2 points per positive response)
+    score = positive_responses * 2
+    max_score = total_responses * 2 if total_responses > 0 else 10
+    
+    # Normalize scores to ensure consistent max points
+    standard_max_score = 10  # Standard max score for each section
+    normalization_factor = standard_max_score / max_score if max_score > 0 else 1
+    normalized_score = score * normalization_factor
+    
+    percentage = (normalized_score / standard_max_score * 100) if standard_max_score > 0 else 0
+    
+    # Determine color based on percentage
+    if percentage >= 80:
+        color = 'green'
+    elif percentage >= 60:
+        color = 'yellow'
+    else:
+        color = 'red'
+    
+    return {
+        'score': round(normalized_score, 1),
+        'raw_score': score,
+        'max_score': standard_max_score,
+        'raw_max_score': max_score,
+        'percentage': round(percentage, 1),
+        'color': color,
+        'questions_completed': total_responses,
+        'total_questions': max(total_responses, 5),
+        'normalized': True
+    }
 
 # Helper function to calculate store score
 def calculate_store_score(store_id: str) -> Dict[str, Any]:
     """Calculate the overall score for a store"""
-    try:
-        if store_id not in responses_storage:
-            return {
-                'overall_score': 0,
-                'overall_max_score': 46,
-                'overall_percentage': 0,
-                'overall_color': 'red',
-                'sections_completed': 0,
-                'total_sections': 5,
-                'section_scores': {},
-                'normalized': True
-            }
-        
-        store_data = responses_storage[store_id]
-        sections = ['availability', 'checkout', 'fulfillment', 'people', 'culture']
-        
-        total_score = 0
-        total_max_score = 0
-        sections_completed = 0
-        section_scores = {}
-        
-        # Standard max scores for each section
-        standard_section_scores = {
-            'availability': 10,
-            'checkout': 10,
-            'fulfillment': 8,
-            'people': 10,
-            'culture': 8
-        }
-        
-        for section in sections:
-            section_score = calculate_section_score(store_id, section)
-            section_scores[section] = section_score
-            
-            total_score += section_score['score']
-            total_max_score += standard_section_scores.get(section, 10)
-            
-            if section_score['questions_completed'] > 0:
-                sections_completed += 1
-        
-        overall_percentage = (total_score / total_max_score * 100) if total_max_score > 0 else 0
-        
-        # Determine overall color
-        if overall_percentage >= 80:
-            overall_color = 'green'
-        elif overall_percentage >= 60:
-            overall_color = 'yellow'
-        else:
-            overall_color = 'red'
-        
-        return {
-            'overall_score': round(total_score, 1),
-            'overall_max_score': total_max_score,
-            'overall_percentage': round(overall_percentage, 1),
-            'overall_color': overall_color,
-            'sections_completed': sections_completed,
-            'total_sections': len(sections),
-            'section_scores': section_scores,
-            'normalized': True
-        }
-    except Exception as e:
-        logger.error(f"Error calculating store score: {e}")
-        logger.error(traceback.format_exc())
+    store_data = responses_storage.get(store_id)
+    if store_data is None:
         return {
             'overall_score': 0,
             'overall_max_score': 46,
@@ -209,47 +356,93 @@ def calculate_store_score(store_id: str) -> Dict[str, Any]:
             'sections_completed': 0,
             'total_sections': 5,
             'section_scores': {},
-            'normalized': True,
-            'error': str(e)
+            'normalized': True
         }
+    
+    total_score = 0
+    total_max_score = 0
+    sections_completed = 0
+    section_scores = {}
+    
+    for section in STORE_SECTIONS:
+        section_score = calculate_section_score(store_id, section)
+        section_scores[section] = section_score
+        
+        total_score += section_score['score']
+        total_max_score += STANDARD_SECTION_SCORES.get(section, 10)
+        
+        if section_score['questions_completed'] > 0:
+            sections_completed += 1
+    
+    overall_percentage = (total_score / total_max_score * 100) if total_max_score > 0 else 0
+    
+    # Determine overall color
+    if overall_percentage >= 80:
+        overall_color = 'green'
+    elif overall_percentage >= 60:
+        overall_color = 'yellow'
+    else:
+        overall_color = 'red'
+    
+    return {
+        'overall_score': round(total_score, 1),
+        'overall_max_score': total_max_score,
+        'overall_percentage': round(overall_percentage, 1),
+        'overall_color': overall_color,
+        'sections_completed': sections_completed,
+        'total_sections': len(STORE_SECTIONS),
+        'section_scores': section_scores,
+        'normalized': True
+    }
+
+# Public API endpoints, listed by the health check and the 404 handler
+ENDPOINTS = (
+    '/api/health',
+    '/api/save_response',
+    '/api/get_responses/<store>/<section>',
+    '/api/get_store_score/<store>',
+    '/api/get_section_score/<store>/<section>',
+    '/api/batch_save_responses',
+    '/api/refresh_scores/<store>/<section>',
+    '/api/report'
+)
+
+# Health check and root bodies never change, so serialize them once at import
+_HEALTH_BODY = orjson.dumps({
+    'status': 'healthy',
+    'service': 'OSR Assessment API',
+    'version': '2.0',
+    'endpoints': ENDPOINTS
+})
+
+_ROOT_BODY = orjson.dumps({
+    'message': 'OSR Assessment API is running',
+    'version': '2.0',
+    'endpoints': {
+        'health': '/api/health',
+        'save_response': '/api/save_response',
+        'get_responses': '/api/get_responses/<store>/<section>',
+        'get_store_score': '/api/get_store_score/<store>',
+        'get_section_score': '/api/get_section_score/<store>/<section>',
+        'batch_save_responses': '/api/batch_save_responses',
+        'refresh_scores': '/api/refresh_scores/<store>/<section>',
+        'report': '/api/report'
+    }
+})
 
 # Health check endpoint
 @app.route('/api/health', methods=['GET'])
 def health_check():
     """Health check endpoint for Railway"""
-    return jsonify({
-        'status': 'healthy',
-        'timestamp': datetime.datetime.utcnow().isoformat(),
-        'service': 'OSR Assessment API',
-        'version': '2.0',
-        'endpoints': [
-            '/api/health',
-            '/api/save_response',
-            '/api/get_responses/<store>/<section>',
-            '/api/get_store_score/<store>',
-            '/api/get_section_score/<store>/<section>',
-            '/api/batch_save_responses',
-            '/api/refresh_scores/<store>/<section>'
-        ]
-    }), 200
+    # Splice the request timestamp in front of the pre-serialized fields
+    body = b'{"timestamp":' + orjson.dumps(g.timestamp) + b',' + _HEALTH_BODY[1:]
+    return app.response_class(body, status=200, mimetype='application/json')
 
 # Root endpoint
 @app.route('/', methods=['GET'])
 def root():
     """Root endpoint"""
-    return jsonify({
-        'message': 'OSR Assessment API is running',
-        'version': '2.0',
-        'endpoints': {
-            'health': '/api/health',
-            'save_response': '/api/save_response',
-            'get_responses': '/api/get_responses/<store>/<section>',
-            'get_store_score': '/api/get_store_score/<store>',
-            'get_section_score': '/api/get_section_score/<store>/<section>',
-            'batch_save_responses': '/api/batch_save_responses',
-            'refresh_scores': '/api/refresh_scores/<store>/<section>'
-        }
-    })
+    return app.response_class(_ROOT_BODY, mimetype='application/json')
 
 # API Endpoints
 
@@ -260,54 +453,43 @@ def save_response():
     # Get JSON data from request
     data = request.get_json()
     
-    if not data:
+    if not data or not isinstance(data, dict):
         return jsonify({
             'success': False,
             'error': 'No JSON data provided'
         }), 400
     
     # Validate required fields
-    required_fields = ['store', 'section', 'question_id', 'procedure_index', 'response']
-    for field in required_fields:
-        if field not in data:
-            return jsonify({
-                'success': False,
-                'error': f'Missing required field: {field}'
-            }), 400
-    
-    store_id = str(data['store'])
-    section_id = str(data['section'])
-    question_id = str(data['question_id'])
-    procedure_index = str(data['procedure_index'])
-    response = data['response']
-    
-    # Validate store and section IDs
-    if not store_id or store_id == 'undefined':
+    missing_fields = SAVE_REQUIRED_FIELDS.difference(data)
+    if missing_fields:
         return jsonify({
             'success': False,
-            'error': 'Invalid store ID'
+            'error': f'Missing required fields: {", ".join(sorted(missing_fields))}'
         }), 400
     
-    if not section_id or section_id == 'undefined':
-        return jsonify({
-            'success': False,
-            'error': 'Invalid section ID'
-        }), 400
+    # Validate store and section IDs
+    store_id, section_id, error_response = validate_ids(data['store'], data['section'])
+    if error_response:
+        return error_response
     
-    # Ensure storage structure exists
-    ensure_storage_structure(store_id, section_id)
+    question_id = str(data['question_id'])
+    procedure_index = str(data['procedure_index'])
+    response = data['response']
     
     # Create response key
     response_key = f"{question_id}-{procedure_index}"
     
     # Add timestamp to response
     if isinstance(response, dict):
-        response['saved_timestamp'] = datetime.datetime.utcnow().isoformat()
+        response = ResponseRecord.from_payload(response, g.timestamp)
     
     # Save the response
-    responses_storage[store_id][section_id][response_key] = response
+    with section_lock(store_id, section_id):
+        ensure_storage_structure(store_id, section_id)
+        store_response(store_id, section_id, response_key, response)
+        mark_section_changed(store_id, section_id)
     
-    logger.info(f"Saved response for {store_id}-{section_id}-{response_key}")
+    logger.info("Saved response for %s-%s-%s", store_id, section_id, response_key)
     
     # Return JSON response
     return jsonify({
@@ -317,106 +499,93 @@ def save_response():
         'section': section_id,
         'question_id': question_id,
         'procedure_index': procedure_index,
-        'timestamp': datetime.datetime.utcnow().isoformat()
+        'timestamp': g.timestamp
     })
 
 @app.route('/api/get_responses/<store>/<section>', methods=['GET'])
 @handle_errors
 def get_responses(store, section):
     """Get all responses for a specific store and section"""
-    store_id = str(store)
-    section_id = str(section)
-    
     # Validate store and section IDs
-    if not store_id or store_id == 'undefined':
-        return jsonify({
-            'success': False,
-            'error': 'Invalid store ID'
-        }), 400
-    
-    if not section_id or section_id == 'undefined':
-        return jsonify({
-            'success': False,
-            'error': 'Invalid section ID'
-        }), 400
+    store_id, section_id, error_response = validate_ids(store, section)
+    if error_response:
+        return error_response
     
     # Get responses from storage
-    if store_id in responses_storage and section_id in responses_storage[store_id]:
-        responses = responses_storage[store_id][section_id]
-    else:
-        responses = {}
+    responses = responses_storage.get(store_id, _EMPTY).get(section_id, _EMPTY)
     
-    logger.info(f"Retrieved {len(responses)} responses for {store_id}-{section_id}")
+    logger.info("Retrieved %d responses for %s-%s", len(responses), store_id, section_id)
     
     # Return JSON response
-    return jsonify({
+    return json_response({
         'success': True,
         'store': store_id,
         'section': section_id,
         'responses': responses,
         'count': len(responses),
-        'timestamp': datetime.datetime.utcnow().isoformat()
+        'timestamp': g.timestamp
     })
 
 @app.route('/api/get_store_score/<store>', methods=['GET'])
 @handle_errors
 def get_store_score(store):
     """Get overall score for a store"""
-    store_id = str(store)
-    
     # Validate store ID
-    if not store_id or store_id == 'undefined':
-        return jsonify({
-            'success': False,
-            'error': 'Invalid store ID'
-        }), 400
+    store_id, _, error_response = validate_ids(store)
+    if error_response:
+        return error_response
+    
+    # Skip the calculation if the client's copy is current
+    etag = store_etag(store_id)
+    cached_response = not_modified_response(etag)
+    if cached_response:
+        return cached_response
     
     # Calculate store score
     score = calculate_store_score(store_id)
     
-    logger.info(f"Calculated store score for {store_id}: {score['overall_percentage']}%")
+    logger.info("Calculated store score for %s: %s%%", store_id, score['overall_percentage'])
     
     # Return JSON response
-    return jsonify({
+    response = json_response({
         'success': True,
         'store': store_id,
         'score': score,
-        'timestamp': datetime.datetime.utcnow().isoformat()
+        'timestamp': g.timestamp
     })
+    response.set_etag(etag, weak=True)
+    return response
 
 @app.route('/api/get_section_score/<store>/<section>', methods=['GET'])
 @handle_errors
 def get_section_score(store, section):
     """Get score for a specific section"""
-    store_id = str(store)
-    section_id = str(section)
-    
     # Validate store and section IDs
-    if not store_id or store_id == 'undefined':
-        return jsonify({
-            'success': False,
-            'error': 'Invalid store ID'
-        }), 400
+    store_id, section_id, error_response = validate_ids(store, section)
+    if error_response:
+        return error_response
     
-    if not section_id or section_id == 'undefined':
-        return jsonify({
-            'success': False,
-            'error': 'Invalid section ID'
-        }), 400
+    # Skip the calculation if the client's copy is current
+    etag = section_etag(store_id, section_id)
+    cached_response = not_modified_response(etag)
+    if cached_response:
+        return cached_response
     
     # Calculate section score
     score = calculate_section_score(store_id, section_id)
     
-    logger.info(f"Calculated section score for {store_id}-{section_id}: {score['percentage']}%")
+    logger.info("Calculated section score for %s-%s: %s%%", store_id, section_id, score['percentage'])
     
     # Return JSON response
-    return jsonify({
+    response = jsonify({
         'success': True,
         'store': store_id,
         'section': section_id,
         'score': score,
-        'timestamp': datetime.datetime.utcnow().isoformat()
+        'timestamp': g.timestamp
     })
+    response.set_etag(etag, weak=True)
+    return response
 
 @app.route('/api/batch_save_responses', methods=['POST'])
 @handle_errors
@@ -425,51 +594,50 @@ def batch_save_responses():
     # Get JSON data from request
     data = request.get_json()
     
-    if not data:
+    if not data or not isinstance(data, dict):
         return jsonify({
             'success': False,
             'error': 'No JSON data provided'
         }), 400
     
     # Validate required fields
-    required_fields = ['store', 'section', 'responses']
-    for field in required_fields:
-        if field not in data:
-            return jsonify({
-                'success': False,
-                'error': f'Missing required field: {field}'
-            }), 400
-    
-    store_id = str(data['store'])
-    section_id = str(data['section'])
-    responses = data['responses']
-    
-    # Validate store and section IDs
-    if not store_id or store_id == 'undefined':
+    missing_fields = BATCH_REQUIRED_FIELDS.difference(data)
+    if missing_fields:
         return jsonify({
             'success': False,
-            'error': 'Invalid store ID'
+            'error': f'Missing required fields: {", ".join(sorted(missing_fields))}'
         }), 400
     
-    if not section_id or section_id == 'undefined':
+    # Validate store and section IDs
+    store_id, section_id, error_response = validate_ids(data['store'], data['section'])
+    if error_response:
+        return error_response
+    
+    responses = data['responses']
+    
+    # Validate responses before touching storage
+    if not isinstance(responses, dict):
         return jsonify({
             'success': False,
-            'error': 'Invalid section ID'
+            'error': 'Invalid responses data'
         }), 400
     
-    # Ensure storage structure exists
-    ensure_storage_structure(store_id, section_id)
-    
     # Save all responses
     saved_count = 0
-    for response_key, response in responses.items():
-        if isinstance(response, dict):
-            response['saved_timestamp'] = datetime.datetime.utcnow().isoformat()
+    saved_timestamp = g.timestamp
+    with section_lock(store_id, section_id):
+        ensure_storage_structure(store_id, section_id)
         
-        responses_storage[store_id][section_id][response_key] = response
-        saved_count += 1
+        for response_key, response in responses.items():
+            if isinstance(response, dict):
+                response = ResponseRecord.from_payload(response, saved_timestamp)
+            
+            store_response(store_id, section_id, response_key, response)
+            saved_count += 1
+        
+        mark_section_changed(store_id, section_id)
     
-    logger.info(f"Batch saved {saved_count} responses for {store_id}-{section_id}")
+    logger.info("Batch saved %d responses for %s-%s", saved_count, store_id, section_id)
     
     # Return JSON response
     return jsonify({
@@ -478,30 +646,33 @@ def batch_save_responses():
         'store': store_id,
         'section': section_id,
         'saved_count': saved_count,
-        'timestamp': datetime.datetime.utcnow().isoformat()
+        'timestamp': g.timestamp
     })
 
 @app.route('/api/refresh_scores/<store>/<section>', methods=['POST'])
 @handle_errors
 def refresh_scores(store, section):
     """Refresh scores for a store/section"""
-    store_id = str(store)
+    # Validate store ID
+    store_id, _, error_response = validate_ids(store)
+    if error_response:
+        return error_response
+    
     section_id = str(section) if section != 'all' else None
     
-    # Validate store ID
-    if not store_id or store_id == 'undefined':
-        return jsonify({
-            'success': False,
-            'error': 'Invalid store ID'
-        }), 400
+    # Drop cached scores so they are recalculated from storage
+    if section_id:
+        invalidate_section_score(store_id, section_id)
+    else:
+        score_cache.pop(store_id, None)
     
     # Recalculate scores
     if section_id:
         score = calculate_section_score(store_id, section_id)
-        logger.info(f"Refreshed section score for {store_id}-{section_id}: {score['percentage']}%")
+        logger.info("Refreshed section score for %s-%s: %s%%", store_id, section_id, score['percentage'])
     else:
         score = calculate_store_score(store_id)
-        logger.info(f"Refreshed store score for {store_id}: {score['overall_percentage']}%")
+        logger.info("Refreshed store score for %s: %s%%", store_id, score['overall_percentage'])
     
     # Return JSON response
     return jsonify({
@@ -509,7 +680,34 @@ def refresh_scores(store, section):
         'message': 'Scores refreshed successfully',
         'store': store_id,
         'section': section_id,
-        'timestamp': datetime.datetime.utcnow().isoformat()
+        'timestamp': g.timestamp
+    })
+
+@app.route('/api/report', methods=['GET'])
+@handle_errors
+def report():
+    """Summarize section and overall percentages for every store"""
+    stores = {}
+    for store_id in list(responses_storage):
+        # Section scores come from score_cache, so this is a few lookups per store
+        score = calculate_store_score(store_id)
+        stores[store_id] = {
+            'overall_percentage': score['overall_percentage'],
+            'overall_color': score['overall_color'],
+            'sections_completed': score['sections_completed'],
+            'section_percentages': {
+                section: section_score['percentage']
+                for section, section_score in score['section_scores'].items()
+            }
+        }
+    
+    logger.info("Built report for %d stores", len(stores))
+    
+    return json_response({
+        'success': True,
+        'stores': stores,
+        'stores_count': len(stores),
+        'timestamp': g.timestamp
     })
 
 # Debug endpoints
@@ -517,11 +715,12 @@ def refresh_scores(store, section):
 @handle_errors
 def debug_storage():
     """Debug endpoint to view all stored data"""
-    return jsonify({
+    # One orjson.dumps call builds the whole body, so compression still applies
+    return json_response({
         'success': True,
         'storage': responses_storage,
         'stores_count': len(responses_storage),
-        'timestamp': datetime.datetime.utcnow().isoformat()
+        'timestamp': g.timestamp
     })
 
 # Error handlers
@@ -532,21 +731,13 @@ def not_found(error):
         'success': False,
         'error': 'Not found',
         'message': f'The requested URL {request.url} was not found on the server.',
-        'available_endpoints': [
-            '/api/health',
-            '/api/save_response',
-            '/api/get_responses/<store>/<section>',
-            '/api/get_store_score/<store>',
-            '/api/get_section_score/<store>/<section>',
-            '/api/batch_save_responses',
-            '/api/refresh_scores/<store>/<section>'
-        ]
+        'available_endpoints': ENDPOINTS
     }), 404
 
 @app.errorhandler(500)
 def server_error(error):
     """Handle 500 errors"""
-    logger.error(f"Internal server error: {str(error)}")
+    logger.error("Internal server error: %s", error)
     return jsonify({
         'success': False,
         'error': 'Internal server error',
@@ -567,17 +758,52 @@ if __name__ == '__main__':
     port = int(os.environ.get('PORT', 8080))
     
     # Log startup information
-    logger.info(f"🚀 Starting OSR Assessment API server...")
-    logger.info(f"   Port: {port}")
-    logger.info(f"   Environment: {os.environ.get('FLASK_ENV', 'production')}")
-    logger.info(f"   Debug: {os.environ.get('FLASK_DEBUG', 'false')}")
+    logger.info("🚀 Starting OSR Assessment API server...")
+    logger.info("   Port: %s", port)
+    logger.info("   Environment: %s", os.environ.get('FLASK_ENV', 'production'))
+    logger.info("   Debug: %s", os.environ.get('FLASK_DEBUG', 'false'))
     
     # Log all registered routes
     logger.info("📋 Registered API endpoints:")
     for rule in app.url_map.iter_rules():
         if rule.rule.startswith('/api/'):
-            logger.info(f"  {list(rule.methods)} {rule.rule}")
+            logger.info("  %s %s", list(rule.methods), rule.rule)
     
-    # Run the app
-    app.run(host='0.0.0.0', port=port, debug=False)
+    # Use the Flask development server only in development
+    if os.environ.get('FLASK_ENV', 'production') == 'development':
+        app.run(host='0.0.0.0', port=port, debug=False)
+    else:
+        try:
+            import gunicorn.app.base
+            
+            class StandaloneApplication(gunicorn.app.base.BaseApplication):
+                def __init__(self, app, options=None):
+                    self.options = options or {}
+                    self.application = app
+                    super().__init__()
+                    
+                def load_config(self):
+                    for key, value in self.options.items():
+                        if key in self.cfg.settings and value is not None:
+                            self.cfg.set(key.lower(), value)
+                            
+                def load(self):
+                    return self.application
+            
+            # Single worker because responses_storage is process-local
+            options = {
+                'bind': f'0.0.0.0:{port}',
+                'workers': 1,
+                'worker_class': 'gevent',
+                'worker_connections': 1000,
+                'timeout': 120,
+                'loglevel': 'info'
+            }
+            
+            logger.info("   Starting Gunicorn WSGI server with gevent worker")
+            StandaloneApplication(app, options).run()
+            
+        except ImportError:
+            logger.warning("⚠️ Gunicorn not installed. Falling back to Flask development server.")
+            app.run(host='0.0.0.0', port=port, debug=False)
 
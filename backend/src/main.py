@@ -4,58 +4,178 @@ OSR Assessment Tool - Flask Backend - v1.0
 Optimized version with Gunicorn WSGI server, session handling, and memory optimization
 """
 
-from flask import Flask, jsonify, request, send_from_directory, session
+from flask import Flask, Response, jsonify, request, send_from_directory, session
+from flask.json.provider import DefaultJSONProvider
+from flask_compress import Compress
 from flask_cors import CORS
 from flask_session import Session
 import os
 import sys
+import orjson
 import logging
-import multiprocessing
 import gc
-import gzip
 import psutil
-from datetime import datetime, timedelta
+import time
+from datetime import datetime, timedelta, timezone
 
 # Import the assessment blueprint
 from routes.assessment import assessment_bp
 
+# Let CPython's generational GC run on its own, but raise the gen0 threshold
+# (16x the default of 700, overridable with GC_THR0) so request allocation churn
+# triggers fewer collections
+gc.set_threshold(int(os.environ.get('GC_THR0', str(700 * 16))), 10, 10)
+
+# Duration and generation of the most recent collection, reported by /api/health
+_gc_stats = {'start': 0.0, 'last_gc_ms': 0.0, 'last_gc_generation': None}
+
+# Helper function to time collections as the GC reports them
+def _gc_callback(phase, info):
+    """Record how long each garbage collection took"""
+    if phase == 'start':
+        _gc_stats['start'] = time.perf_counter()
+    else:
+        _gc_stats['last_gc_ms'] = (time.perf_counter() - _gc_stats['start']) * 1000
+        _gc_stats['last_gc_generation'] = info['generation']
+        logging.getLogger(__name__).debug(
+            "gc gen=%s collected=%s", info['generation'], info['collected']
+        )
+
+gc.callbacks.append(_gc_callback)
+
+# orjson options shared by the JSON provider: allow non-str dict keys and mark
+# naive datetimes as UTC (the app only produces utcnow() values)
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_NAIVE_UTC
+
+# JSON provider backed by orjson, used by jsonify and request.get_json
+class OrjsonProvider(DefaultJSONProvider):
+    """Serialize and parse JSON with orjson instead of the stdlib json module"""
+    
+    @staticmethod
+    def default(obj):
+        """Serialize types orjson does not handle natively"""
+        if hasattr(obj, 'isoformat'):
+            return obj.isoformat()
+        # Fall back to Flask's handling (Decimal, __html__, ...)
+        return DefaultJSONProvider.default(obj)
+    
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default, option=ORJSON_OPTIONS).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+    
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, default=self.default, option=ORJSON_OPTIONS),
+            mimetype='application/json'
+        )
+
+# Process handle reused by the health check; rebuilt if the pid changes, since
+# with preload_app this module is imported in the Gunicorn master before forking
+_PROC = psutil.Process(os.getpid())
+
+# (timestamp, value) cache so psutil.virtual_memory() runs at most once per second
+_VIRTUAL_MEMORY_CACHE = (0.0, None)
+
+# Helper function to get the psutil.Process for the current worker
+def get_process():
+    """Return the cached psutil.Process for this process"""
+    global _PROC
+    if _PROC.pid != os.getpid():
+        _PROC = psutil.Process(os.getpid())
+    return _PROC
+
+# Helper function to get system memory, refreshed at most once per second
+def get_virtual_memory():
+    """Return psutil.virtual_memory(), cached for one second"""
+    global _VIRTUAL_MEMORY_CACHE
+    now = time.monotonic()
+    cached_at, value = _VIRTUAL_MEMORY_CACHE
+    if value is None or now - cached_at >= 1.0:
+        value = psutil.virtual_memory()
+        _VIRTUAL_MEMORY_CACHE = (now, value)
+    return value
+
+# [second, formatted] cache so response timestamps are formatted at most once per second
+_ts_cache = [0, ""]
+
+# Helper function to get the current UTC time as an ISO string, at 1-second granularity
+def _now_iso():
+    """Return the current UTC time formatted with isoformat(), cached per second"""
+    it = int(time.time())
+    c = _ts_cache
+    if c[0] != it:
+        c[1] = datetime.fromtimestamp(it, timezone.utc).replace(tzinfo=None).isoformat()
+        c[0] = it
+    return c[1]
+
 def create_app():
     """Create and configure the Flask application"""
     app = Flask(__name__)
+    app.json = OrjsonProvider(app)
     
     # Enhanced application configuration
     app.config.update(
         SECRET_KEY=os.environ.get('SECRET_KEY', 'dev-key-change-in-production'),
-        SESSION_TYPE='filesystem',  # Use filesystem for session storage
         SESSION_PERMANENT=True,
-        PERMANENT_SESSION_LIFETIME=timedelta(days=30),
+        PERMANENT_SESSION_LIFETIME=timedelta(days=30),  # Applied as the Redis key TTL
         SESSION_USE_SIGNER=True,
-        SESSION_FILE_DIR='/tmp/flask_session',  # Use /tmp for Railway
-        SESSION_FILE_THRESHOLD=500,
-        JSON_SORT_KEYS=False,
         JSONIFY_PRETTYPRINT_REGULAR=False,
         MAX_CONTENT_LENGTH=16 * 1024 * 1024,  # 16 MB max upload
+        COMPRESS_ALGORITHM='gzip',
+        COMPRESS_LEVEL=6,  # Level 9 costs more CPU for little extra saving
+        COMPRESS_MIN_SIZE=500,
+        # Flask-Compress already skips responses that carry a Content-Encoding
+        COMPRESS_MIMETYPES=['application/json', 'text/html', 'text/css', 'text/plain',
+                            'application/javascript', 'image/svg+xml'],
     )
     
+    # Store sessions in Redis when available so all workers and hosts share
+    # them; otherwise fall back to files under /tmp for single-host deploys
+    redis_url = os.environ.get('REDIS_URL')
+    if redis_url:
+        import redis
+        
+        app.config.update(
+            SESSION_TYPE='redis',
+            SESSION_REDIS=redis.Redis.from_url(
+                redis_url,
+                socket_keepalive=True,
+                health_check_interval=30,
+                max_connections=50
+            ),
+        )
+    else:
+        app.config.update(
+            SESSION_TYPE='filesystem',
+            SESSION_FILE_DIR='/tmp/flask_session',  # Use /tmp for Railway
+            SESSION_FILE_THRESHOLD=500,
+        )
+    
     # Initialize Flask-Session
     Session(app)
     
+    # Compress responses for clients that send Accept-Encoding: gzip
+    Compress(app)
+    
     # Configure CORS to allow all origins (required for frontend-backend communication)
+    # Cover every route (including / and error responses), not just /api
     CORS(app, resources={
-        r"/api/*": {
+        r"/*": {
             "origins": "*",
             "methods": ["GET", "POST", "PUT", "DELETE", "OPTIONS"],
             "allow_headers": ["Content-Type", "Authorization", "Accept"]
         }
     })
     
-    # Configure logging
+    # Configure logging (stderr only; Gunicorn's errorlog collects it from every worker)
     logging.basicConfig(
         level=logging.INFO,
         format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
         handlers=[
-            logging.StreamHandler(),
-            logging.FileHandler('api.log')
+            logging.StreamHandler()
         ]
     )
     app.logger.setLevel(logging.INFO)
@@ -64,105 +184,85 @@ def create_app():
     app.register_blueprint(assessment_bp, url_prefix="/api")
     app.logger.info("✅ Assessment blueprint registered at /api")
     
-    # Add periodic garbage collection
-    @app.before_request
-    def before_request():
-        """Run garbage collection before each request to free memory"""
-        gc.collect()
-        
-    # Limit response size and compress responses
-    @app.after_request
-    def after_request(response):
-        """Compress responses to reduce bandwidth usage"""
-        # Compress responses larger than 500 bytes
-        if (response.content_length is not None and 
-            response.content_length > 500 and 
-            (response.content_type.startswith('text/') or 
-             response.content_type == 'application/json')):
-            response.headers['Content-Encoding'] = 'gzip'
-            response.set_data(gzip.compress(response.get_data()))
-        
-        # Add CORS headers
-        response.headers.add('Access-Control-Allow-Origin', '*')
-        response.headers.add('Access-Control-Allow-Headers', 'Content-Type,Authorization')
-        response.headers.add('Access-Control-Allow-Methods', 'GET,PUT,POST,DELETE,OPTIONS')
-        
-        return response
-    
     # Health check endpoint (not in blueprint for simplicity)
     @app.route('/api/health', methods=['GET'])
     def health_check():
         """Health check endpoint that returns proper JSON with memory usage info"""
         try:
             # Get memory usage information
-            process = psutil.Process(os.getpid())
-            memory_info = process.memory_info()
+            memory_info = get_process().memory_info()
             memory_usage_mb = memory_info.rss / (1024 * 1024)  # Convert to MB
             
             # Get system memory information
-            system_memory = psutil.virtual_memory()
+            system_memory = get_virtual_memory()
             available_memory_mb = system_memory.available / (1024 * 1024)  # Convert to MB
             
             return jsonify({
                 'success': True,
                 'status': 'healthy',
-                'timestamp': datetime.utcnow().isoformat(),
+                'timestamp': _now_iso(),
                 'service': 'OSR Assessment API',
                 'version': '1.1.0',
                 'environment': os.environ.get('FLASK_ENV', 'production'),
                 'memory_usage': {
                     'process_memory_mb': round(memory_usage_mb, 2),
                     'available_memory_mb': round(available_memory_mb, 2),
-                    'percent_used': round(system_memory.percent, 2)
+                    'percent_used': round(system_memory.percent, 2),
+                    'last_gc_ms': round(_gc_stats['last_gc_ms'], 3),
+                    'last_gc_generation': _gc_stats['last_gc_generation']
                 }
             }), 200
         except Exception as e:
-            app.logger.error(f"Health check error: {str(e)}")
+            app.logger.error("Health check error: %s", e)
             return jsonify({
                 'success': False,
                 'status': 'unhealthy',
                 'error': str(e),
-                'timestamp': datetime.utcnow().isoformat()
+                'timestamp': _now_iso()
             }), 500
     
+    # Endpoints advertised by the root endpoint and the 404 handler
+    endpoints = {
+        'health': '/api/health',
+        'save_response': '/api/save_response',
+        'get_responses': '/api/get_responses/<store>/<section>',
+        'get_store_score': '/api/get_store_score/<store>',
+        'get_section_score': '/api/get_section_score/<store>/<section>'
+    }
+    available_endpoints = list(endpoints.values())
+    
+    # The root body only varies by timestamp, so serialize the rest once
+    # (without the closing brace) and append the timestamp per request
+    root_body_prefix = orjson.dumps({
+        'success': True,
+        'message': 'OSR Assessment API is running',
+        'endpoints': endpoints
+    })[:-1]
+    
     # Root endpoint
     @app.route('/', methods=['GET'])
     def root():
         """Root endpoint that returns API info"""
-        return jsonify({
-            'success': True,
-            'message': 'OSR Assessment API is running',
-            'endpoints': {
-                'health': '/api/health',
-                'save_response': '/api/save_response',
-                'get_responses': '/api/get_responses/<store>/<section>',
-                'get_store_score': '/api/get_store_score/<store>',
-                'get_section_score': '/api/get_section_score/<store>/<section>'
-            },
-            'timestamp': datetime.utcnow().isoformat()
-        })
+        timestamp = orjson.dumps(_now_iso())
+        return Response(root_body_prefix + b',"timestamp":' + timestamp + b'}', mimetype='application/json')
     
     # Error handlers that return JSON instead of HTML
+    # The 404 body only varies by URL, so keep the rest pre-serialized around it
+    not_found_prefix = b'{"success":false,"error":"Endpoint not found","message":"The requested URL '
+    not_found_suffix = (b' was not found on this server.","available_endpoints":'
+                        + orjson.dumps(available_endpoints) + b'}')
+    
     @app.errorhandler(404)
     def not_found(error):
         """Return JSON for 404 errors instead of HTML"""
-        return jsonify({
-            'success': False,
-            'error': 'Endpoint not found',
-            'message': f'The requested URL {request.url} was not found on this server.',
-            'available_endpoints': [
-                '/api/health',
-                '/api/save_response',
-                '/api/get_responses/<store>/<section>',
-                '/api/get_store_score/<store>',
-                '/api/get_section_score/<store>/<section>'
-            ]
-        }), 404
+        # orjson escapes the URL as a JSON string; strip its surrounding quotes
+        url = orjson.dumps(request.url)[1:-1]
+        return Response(not_found_prefix + url + not_found_suffix, status=404, mimetype='application/json')
     
     @app.errorhandler(500)
     def internal_error(error):
         """Return JSON for 500 errors instead of HTML"""
-        app.logger.error(f"Internal server error: {str(error)}")
+        app.logger.error("Internal server error: %s", error)
         return jsonify({
             'success': False,
             'error': 'Internal server error',
@@ -181,7 +281,7 @@ def create_app():
     @app.errorhandler(Exception)
     def handle_exception(e):
         """Global error handler for all exceptions"""
-        app.logger.error(f"Unhandled exception: {str(e)}")
+        app.logger.error("Unhandled exception: %s", e)
         return jsonify({
             'success': False,
             'error': 'Internal server error',
@@ -189,16 +289,22 @@ def create_app():
             'status_code': 500
         }), 500
     
-    # Log all registered routes for debugging
-    app.logger.info("📋 Registered routes:")
-    for rule in app.url_map.iter_rules():
-        app.logger.info(f"  {rule.methods} {rule.rule}")
+    # Log all registered routes for debugging, as a single record, only when asked for
+    if app.debug or os.environ.get('LOG_ROUTES'):
+        app.logger.info("📋 Registered routes:\n" + "\n".join(
+            f"  {sorted(rule.methods)} {rule.rule}" for rule in app.url_map.iter_rules()
+        ))
     
     return app
 
 # Create the Flask app
 app = create_app()
 
+# Move everything allocated during startup into the permanent generation so GC
+# never rescans it; with preload_app, workers inherit the frozen heap on fork
+gc.collect(2)
+gc.freeze()
+
 # Gunicorn WSGI server configuration
 class StandaloneApplication(object):
     def __init__(self, app, options=None):
@@ -255,24 +361,34 @@ if __name__ == '__main__':
                 def load(self):
                     return self.application
             
-            # Calculate optimal number of workers based on CPU cores
-            workers = (2 * multiprocessing.cpu_count()) + 1
+            # Assessment responses are kept in process memory, so a single worker is the
+            # default (each worker would otherwise see only its own writes); requests
+            # are served concurrently on its threads. Raise GUNICORN_WORKERS only once
+            # storage is shared.
+            workers = int(os.environ.get('GUNICORN_WORKERS', '1'))
+            threads = int(os.environ.get('GUNICORN_THREADS', '8'))
             
             # Configure Gunicorn options
             options = {
                 'bind': f'{host}:{port}',
                 'workers': workers,
-                'worker_class': 'gevent',
+                'worker_class': 'gthread',
+                'threads': threads,
+                'preload_app': True,  # Load the app once in the master; workers share it copy-on-write
                 'timeout': 120,
-                'keepalive': 5,
-                'max_requests': 1000,
-                'max_requests_jitter': 50,
+                # gthread also caps open connections (idle keep-alives included) per worker;
+                # behind a multiplexing LB, raise GUNICORN_KEEPALIVE (e.g. 75) instead
+                'worker_connections': 500,
+                'keepalive': int(os.environ.get('GUNICORN_KEEPALIVE', '2')),
+                # Worker recycling is off by default; set these if RSS is seen to grow
+                'max_requests': int(os.environ.get('GUNICORN_MAX_REQUESTS', '0')),
+                'max_requests_jitter': int(os.environ.get('GUNICORN_MAX_REQUESTS_JITTER', '0')),
                 'accesslog': '-',
                 'errorlog': '-',
                 'loglevel': 'info'
             }
             
-            print(f"   Starting Gunicorn WSGI server with {workers} workers")
+            print(f"   Starting Gunicorn WSGI server with {workers} workers x {threads} threads")
             StandaloneApplication(app, options).run()
             
         except ImportError:
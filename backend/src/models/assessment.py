@@ -3,22 +3,97 @@ OSR Assessment API Routes
 Fixed version with normalized scoring and improved error handling
 """
 
-from flask import Blueprint, request, jsonify
-import json
+from flask import Blueprint, Response, request, jsonify, make_response
+from flask_caching import Cache
+import orjson
 import os
+import itertools
 import logging
+import threading
+import uuid
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Dict, Any, FrozenSet, Optional, Set, Tuple
+from functools import lru_cache, wraps
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass
+
+# Saved assessment response; the client payload is kept as sent
+@dataclass(slots=True)
+class ResponseRecord:
+    """A stored response together with the fields the server reads from it"""
+    payload: Dict[str, Any]
+    saved_timestamp: str
+    has_issues: Optional[str] = None
+
+    @classmethod
+    def from_payload(cls, payload: Dict[str, Any], saved_timestamp: str) -> 'ResponseRecord':
+        return cls(payload, saved_timestamp, payload.get('hasIssues'))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the response in the shape clients originally sent, plus saved_timestamp"""
+        return {**self.payload, 'saved_timestamp': self.saved_timestamp}
 
 # Create the blueprint
 assessment_bp = Blueprint('assessment', __name__)
 
+# Short-lived cache for the polled score endpoints; writes invalidate it explicitly
+cache = Cache(config={
+    'CACHE_TYPE': 'SimpleCache',  # In-memory cache
+    'CACHE_DEFAULT_TIMEOUT': 5,
+    'CACHE_THRESHOLD': 1000  # Maximum number of items
+})
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
 # In-memory storage for development (replace with database in production)
-# Structure: {store_id: {section_id: {question_id-procedure_index: response}}}
-responses_storage: Dict[str, Dict[str, Dict[str, Any]]] = {}
+# Structure: {(store_id, section_id, question_id-procedure_index): response}
+# Object responses are stored as ResponseRecord, anything else as sent.
+responses_storage: Dict[Tuple[str, str, str], Any] = {}
+
+# Secondary indexes over responses_storage
+# section_index: {(store_id, section_id): {question_id-procedure_index, ...}}
+# store_index: {store_id: {section_id, ...}}, ordered from least to most recently used
+section_index: Dict[Tuple[str, str], Set[str]] = {}
+store_index: 'OrderedDict[str, Set[str]]' = OrderedDict()
+
+# Maximum number of stores kept in memory; the least recently used store is
+# dropped once this is exceeded so storage can't grow without bound
+MAX_STORES = int(os.environ.get('OSR_MAX_STORES', '1024'))
+_evict_lock = threading.Lock()
+
+# Marker for responses removed by a concurrent eviction
+_MISSING = object()
+
+# Number of stores evicted so far; part of every ETag because a re-created store
+# starts its section versions from zero again
+eviction_count = 0
+
+# Per-process ETag prefix so ETags from before a restart never match
+_ETAG_PREFIX = uuid.uuid4().hex[:8]
+
+# Striped locks guarding writes; a store always maps to the same stripe, so
+# writes to different stores rarely contend. Reads stay lock-free.
+LOCK_STRIPES = 32
+_locks = [threading.Lock() for _ in range(LOCK_STRIPES)]
+
+# Helper function to get the lock stripe for a store
+def store_lock(store_id: str) -> threading.Lock:
+    """Return the lock guarding writes to the given store"""
+    return _locks[hash(store_id) & (LOCK_STRIPES - 1)]
+
+# Immutable per-section snapshot: {(store_id, section_id): (positive_count, total_responses, version)}
+# positive_count counts 'hasIssues' == 'no' responses. Writers build a new tuple under
+# the store lock and swap it in with one assignment, so lock-free readers always see
+# a consistent triple; version keys the cached scores.
+section_stats: Dict[Tuple[str, str], Tuple[int, int, int]] = {}
+
+# Write version per store, part of the store score ETag. Values come from one
+# process-wide counter (next() is atomic) and are never reused, so every write,
+# including the one that creates the store, gives the store a new tag
+# Structure: {store_id: version}
+store_versions: Dict[str, int] = {}
+_store_version_counter = itertools.count(1)
 
 # Constants for standardized scoring
 STANDARD_POINTS_PER_PROCEDURE = 2
@@ -31,6 +106,15 @@ STANDARD_MAX_POINTS_PER_SECTION = {
 }
 STANDARD_TOTAL_MAX_POINTS = 46  # Sum of all section standard max points
 
+# Sections that make up a store score, in reporting order
+STORE_SECTIONS = ('availability', 'checkout', 'fulfillment', 'people', 'culture')
+
+# Score color per whole percentage 0-100 (green >= 80, yellow >= 60, else red)
+COLOR_BY_PCT = tuple('green' if p >= 80 else 'yellow' if p >= 60 else 'red' for p in range(101))
+
+# Fields every saved response must carry
+SAVE_REQUIRED_FIELDS = frozenset({'store', 'section', 'question_id', 'procedure_index', 'response'})
+
 # Store foundation questions mapping
 STORE_FOUNDATIONS = {
     '1660': ['people'],
@@ -40,19 +124,185 @@ STORE_FOUNDATIONS = {
     '5686': ['availability', 'fulfillment', 'checkout']
 }
 
+# Flattened (store_id, section_id) pairs that have foundation questions
+FOUNDATION_SET: FrozenSet[Tuple[str, str]] = frozenset(
+    (store_id, section_id)
+    for store_id, sections in STORE_FOUNDATIONS.items()
+    for section_id in sections
+)
+
+# Total questions per section, with and without the 3 extra foundation questions
+FOUNDATION_TOTAL_QUESTIONS = {
+    'people': 8,        # 5 process check + 3 foundation
+    'availability': 7,  # 4 process check + 3 foundation
+    'fulfillment': 7,   # 4 process check + 3 foundation
+    'checkout': 8       # 5 process check + 3 foundation
+}
+STANDARD_TOTAL_QUESTIONS = {
+    'people': 5,
+    'availability': 4,
+    'fulfillment': 4,
+    'checkout': 5,
+    'culture': 4
+}
+DEFAULT_TOTAL_QUESTIONS = 5
+
+# Helper function to derive the fixed scoring values for a section
+def build_section_meta(total_questions: int, standard_max_score: int) -> Tuple[int, int, int, float]:
+    """Return (total_questions, raw_max_score, standard_max_score, normalization_factor)"""
+    # Raw max score is 2 points per question
+    raw_max_score = total_questions * STANDARD_POINTS_PER_PROCEDURE
+    normalization_factor = standard_max_score / raw_max_score if raw_max_score > 0 else 1
+    return total_questions, raw_max_score, standard_max_score, normalization_factor
+
+# Scoring values per (section_id, has_foundation_questions), computed once at import
+SECTION_META: Dict[Tuple[str, bool], Tuple[int, int, int, float]] = {
+    (section_id, has_foundation): build_section_meta(
+        (FOUNDATION_TOTAL_QUESTIONS if has_foundation else STANDARD_TOTAL_QUESTIONS)
+            .get(section_id, DEFAULT_TOTAL_QUESTIONS),
+        standard_max_score
+    )
+    for section_id, standard_max_score in STANDARD_MAX_POINTS_PER_SECTION.items()
+    for has_foundation in (True, False)
+}
+SECTION_META[('__default__', False)] = build_section_meta(DEFAULT_TOTAL_QUESTIONS, 10)
+
 # Helper function to ensure store and section exist in storage
-def ensure_storage_structure(store_id: str, section_id: str) -> None:
-    """Ensure the storage structure exists for the given store and section"""
-    if store_id not in responses_storage:
-        responses_storage[store_id] = {}
-    if section_id not in responses_storage[store_id]:
-        responses_storage[store_id][section_id] = {}
+def ensure_storage_structure(store_id: str, section_id: str) -> Set[str]:
+    """Ensure the indexes exist for the given store and section and return its key set"""
+    store_index.setdefault(store_id, set()).add(section_id)
+    store_index.move_to_end(store_id)
+    return section_index.setdefault((store_id, section_id), set())
 
-# Helper function to calculate section score with normalization
+# Helper function to mark a store as recently used
+def touch_store(store_id: str) -> None:
+    """Move a store to the most recently used end of store_index, if it is stored"""
+    try:
+        store_index.move_to_end(store_id)
+    except KeyError:
+        pass
+
+# Helper function to drop the least recently used stores beyond MAX_STORES
+def evict_cold_stores() -> None:
+    """Remove cold stores and everything indexed under them; call without holding a store lock"""
+    while len(store_index) > MAX_STORES:
+        with _evict_lock:
+            if len(store_index) <= MAX_STORES:
+                return
+            store_id = next(iter(store_index))
+        
+        with store_lock(store_id):
+            sections = store_index.pop(store_id, None)
+            if sections is None:
+                continue
+            global eviction_count
+            eviction_count += 1
+            store_versions.pop(store_id, None)
+            for section_id in sections:
+                section_stats.pop((store_id, section_id), None)
+                for key in section_index.pop((store_id, section_id), ()):
+                    responses_storage.pop((store_id, section_id, key), None)
+        
+        for section_id in sections:
+            invalidate_cached_scores(store_id, section_id)
+        logger.info("Evicted least recently used store %s", store_id)
+
+# Helper function to collect the responses saved for a section
+def get_section_responses(store_id: str, section_id: str) -> Dict[str, Any]:
+    """Return {response_key: response} for a section, empty if it has none"""
+    # Snapshot the key set so a concurrent save can't change it mid-iteration
+    keys = tuple(section_index.get((store_id, section_id), ()))
+    touch_store(store_id)
+    responses = {}
+    for key in keys:
+        response = responses_storage.get((store_id, section_id, key), _MISSING)
+        if response is _MISSING:
+            continue
+        responses[key] = response.to_dict() if isinstance(response, ResponseRecord) else response
+    return responses
+
+# Helper function to parse the request body with orjson instead of request.get_json
+def parse_json_body() -> Any:
+    """Return the decoded JSON body, or None if it is empty or not valid JSON"""
+    try:
+        return orjson.loads(request.get_data())
+    except orjson.JSONDecodeError:
+        return None
+
+# Error handling decorator; action names what the endpoint was doing, for the error message
+def json_errors(action: str):
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            try:
+                return f(*args, **kwargs)
+            except Exception as e:
+                logger.exception("Error %s: %s", action, e)
+                # Return JSON error response
+                return jsonify({
+                    'success': False,
+                    'error': f'Internal server error while {action}',
+                    'details': str(e)
+                }), 500
+        return decorated_function
+    return decorator
+
+# Helper function to check whether a response counts towards the score
+def is_positive_response(response: Any) -> bool:
+    """Return True if the response reports no issues"""
+    return isinstance(response, ResponseRecord) and response.has_issues == 'no'
+
+# Helper function to store a response and publish the section's new stats
+def store_response(store_id: str, section_id: str, response_key: str, response: Any) -> None:
+    """Save a response and swap in updated section stats; the caller holds store_lock"""
+    storage_key = (store_id, section_id, response_key)
+    previous = responses_storage.get(storage_key)
+    is_new = storage_key not in responses_storage
+    delta = is_positive_response(response) - is_positive_response(previous)
+    responses_storage[storage_key] = response
+    
+    stats_key = (store_id, section_id)
+    positive_count, total_responses, version = section_stats.get(stats_key, (0, 0, 0))
+    section_stats[stats_key] = (positive_count + delta, total_responses + is_new, version + 1)
+    store_versions[store_id] = next(_store_version_counter)
+
+# Helper function to mark a section as changed so its cached score is recomputed
+def bump_section_version(store_id: str, section_id: str) -> None:
+    """Advance the version of an existing section; the caller holds store_lock"""
+    key = (store_id, section_id)
+    positive_count, total_responses, version = section_stats[key]
+    section_stats[key] = (positive_count, total_responses, version + 1)
+    store_versions[store_id] = next(_store_version_counter)
+
+# Helper function to drop the cached score responses affected by a write
+def invalidate_cached_scores(store_id: str, section_id: str) -> None:
+    """Delete the cached section score response (store scores are cached per ETag)"""
+    cache.delete(f'section_score_{store_id}_{section_id}')
+
+# Helper function to build the store score ETag from the store's write version (sent
+# as a weak ETag so response compression leaves it unchanged)
+def store_etag(store_id: str) -> str:
+    """Return an ETag that changes whenever the store is created, written or evicted"""
+    return f"{_ETAG_PREFIX}-{eviction_count}-{store_versions.get(store_id, 0)}"
+
+# Helper function to get a section score, reusing the cached one while the section is unchanged
 def calculate_section_score(store_id: str, section_id: str) -> Dict[str, Any]:
-    """Calculate the normalized score for a specific section"""
+    """Return the normalized score for a specific section"""
+    # A single read gives a consistent snapshot without taking the lock
+    return cached_section_score(store_id, section_id, section_stats.get((store_id, section_id)))
+
+@lru_cache(maxsize=4096)
+def cached_section_score(store_id: str, section_id: str,
+                         stats: Optional[Tuple[int, int, int]]) -> Dict[str, Any]:
+    """Memoize compute_section_score per section stats snapshot (which includes the version)"""
+    return compute_section_score(store_id, section_id, stats)
+
+# Helper function to calculate section score with normalization
+def compute_section_score(store_id: str, section_id: str,
+                          stats: Optional[Tuple[int, int, int]]) -> Dict[str, Any]:
+    """Calculate the normalized score for a specific section from its stats snapshot"""
     try:
-        if store_id not in responses_storage or section_id not in responses_storage[store_id]:
+        if stats is None:
             return {
                 'score': 0,
                 'max_score': STANDARD_MAX_POINTS_PER_SECTION.get(section_id, 10),
@@ -63,58 +313,20 @@ def calculate_section_score(store_id: str, section_id: str) -> Dict[str, Any]:
                 'normalized': True
             }
         
-        section_responses = responses_storage[store_id][section_id]
-        
         # Count total responses and positive responses
-        total_responses = len(section_responses)
-        positive_responses = sum(1 for resp in section_responses.values() 
-                               if isinstance(resp, dict) and resp.get('hasIssues') == 'no')
+        positive_responses, total_responses, _ = stats
         
         # Calculate raw score (2 points per positive response)
         raw_score = positive_responses * STANDARD_POINTS_PER_PROCEDURE
         
         # Determine if this section has foundation questions for this store
-        has_foundation_questions = (
-            store_id in STORE_FOUNDATIONS and 
-            section_id in STORE_FOUNDATIONS[store_id]
-        )
+        has_foundation_questions = (store_id, section_id) in FOUNDATION_SET
         
-        # Determine total questions based on section and foundation status
-        if has_foundation_questions:
-            # Sections with foundation questions have more total questions
-            if section_id == 'people':
-                total_questions = 8  # 5 process check + 3 foundation
-            elif section_id == 'availability':
-                total_questions = 7  # 4 process check + 3 foundation
-            elif section_id == 'fulfillment':
-                total_questions = 7  # 4 process check + 3 foundation
-            elif section_id == 'checkout':
-                total_questions = 8  # 5 process check + 3 foundation
-            else:
-                total_questions = 5  # Default
-        else:
-            # Standard sections without foundation questions
-            if section_id == 'people':
-                total_questions = 5
-            elif section_id == 'availability':
-                total_questions = 4
-            elif section_id == 'fulfillment':
-                total_questions = 4
-            elif section_id == 'checkout':
-                total_questions = 5
-            elif section_id == 'culture':
-                total_questions = 4
-            else:
-                total_questions = 5  # Default
-        
-        # Calculate raw max score (2 points per question)
-        raw_max_score = total_questions * STANDARD_POINTS_PER_PROCEDURE
-        
-        # Get standard max score for this section
-        standard_max_score = STANDARD_MAX_POINTS_PER_SECTION.get(section_id, 10)
-        
-        # Calculate normalization factor
-        normalization_factor = standard_max_score / raw_max_score if raw_max_score > 0 else 1
+        # Look up question count, max scores and normalization factor for this section
+        meta = SECTION_META.get((section_id, has_foundation_questions))
+        if meta is None:
+            meta = SECTION_META[('__default__', False)]
+        total_questions, raw_max_score, standard_max_score, normalization_factor = meta
         
         # Normalize the score
         normalized_score = round(raw_score * normalization_factor)
@@ -122,21 +334,17 @@ def calculate_section_score(store_id: str, section_id: str) -> Dict[str, Any]:
         # Calculate percentage based on normalized values
         percentage = round((normalized_score / standard_max_score) * 100) if standard_max_score > 0 else 0
         
-        # Determine color based on normalized percentage
-        if percentage >= 80:
-            color = 'green'
-        elif percentage >= 60:
-            color = 'yellow'
-        else:
-            color = 'red'
+        # Determine color based on normalized percentage (more responses than
+        # questions can push it past 100)
+        color = COLOR_BY_PCT[min(percentage, 100)]
         
         # Log normalization details for debugging
         if normalization_factor != 1:
-            logger.info(f"🔄 NORMALIZED SECTION SCORE - {store_id}/{section_id}: " +
-                       f"raw={raw_score}/{raw_max_score}, " +
-                       f"normalized={normalized_score}/{standard_max_score}, " +
-                       f"factor={normalization_factor}, " +
-                       f"percentage={percentage}%")
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("🔄 NORMALIZED SECTION SCORE - %s/%s: raw=%s/%s, normalized=%s/%s, "
+                            "factor=%s, percentage=%s%%",
+                            store_id, section_id, raw_score, raw_max_score,
+                            normalized_score, standard_max_score, normalization_factor, percentage)
         
         return {
             'score': normalized_score,
@@ -151,7 +359,7 @@ def calculate_section_score(store_id: str, section_id: str) -> Dict[str, Any]:
             'normalization_factor': normalization_factor
         }
     except Exception as e:
-        logger.error(f"Error calculating section score: {e}")
+        logger.error("Error calculating section score: %s", e)
         return {
             'score': 0,
             'max_score': STANDARD_MAX_POINTS_PER_SECTION.get(section_id, 10),
@@ -164,9 +372,18 @@ def calculate_section_score(store_id: str, section_id: str) -> Dict[str, Any]:
 
 # Helper function to calculate store score with normalization
 def calculate_store_score(store_id: str) -> Dict[str, Any]:
-    """Calculate the normalized overall score for a store"""
+    """Calculate the normalized overall score for a store, including every section score"""
+    section_scores: Dict[str, Dict[str, Any]] = {}
+    score = calculate_store_summary(store_id, section_scores)
+    score['section_scores'] = section_scores
+    return score
+
+# Helper function to calculate only the overall numbers for a store
+def calculate_store_summary(store_id: str,
+                            section_scores: Optional[Dict[str, Dict[str, Any]]] = None) -> Dict[str, Any]:
+    """Calculate the normalized overall score for a store, filling section_scores if given"""
     try:
-        if store_id not in responses_storage:
+        if store_id not in store_index:
             return {
                 'overall_score': 0,
                 'overall_max_score': STANDARD_TOTAL_MAX_POINTS,
@@ -174,22 +391,21 @@ def calculate_store_score(store_id: str) -> Dict[str, Any]:
                 'overall_color': 'red',
                 'sections_completed': 0,
                 'total_sections': 5,
-                'section_scores': {},
                 'normalized': True
             }
         
-        store_data = responses_storage[store_id]
-        sections = ['availability', 'checkout', 'fulfillment', 'people', 'culture']
+        touch_store(store_id)
+        sections = STORE_SECTIONS
         
         total_score = 0
         total_max_score = 0
         sections_completed = 0
-        section_scores = {}
         
         # Calculate score for each section
         for section in sections:
             section_score = calculate_section_score(store_id, section)
-            section_scores[section] = section_score
+            if section_scores is not None:
+                section_scores[section] = section_score
             
             total_score += section_score['score']
             total_max_score += section_score['max_score']
@@ -199,7 +415,7 @@ def calculate_store_score(store_id: str) -> Dict[str, Any]:
         
         # Ensure total max score matches the standard
         if total_max_score != STANDARD_TOTAL_MAX_POINTS:
-            logger.warning(f"⚠️ Total max score ({total_max_score}) doesn't match standard ({STANDARD_TOTAL_MAX_POINTS})")
+            logger.warning("⚠️ Total max score (%s) doesn't match standard (%s)", total_max_score, STANDARD_TOTAL_MAX_POINTS)
             # Adjust to standard
             total_max_score = STANDARD_TOTAL_MAX_POINTS
         
@@ -207,12 +423,7 @@ def calculate_store_score(store_id: str) -> Dict[str, Any]:
         overall_percentage = round((total_score / total_max_score * 100)) if total_max_score > 0 else 0
         
         # Determine overall color
-        if overall_percentage >= 80:
-            overall_color = 'green'
-        elif overall_percentage >= 60:
-            overall_color = 'yellow'
-        else:
-            overall_color = 'red'
+        overall_color = COLOR_BY_PCT[min(overall_percentage, 100)]
         
         return {
             'overall_score': total_score,
@@ -221,11 +432,12 @@ def calculate_store_score(store_id: str) -> Dict[str, Any]:
             'overall_color': overall_color,
             'sections_completed': sections_completed,
             'total_sections': len(sections),
-            'section_scores': section_scores,
             'normalized': True
         }
     except Exception as e:
-        logger.error(f"Error calculating store score: {e}")
+        logger.error("Error calculating store score: %s", e)
+        if section_scores is not None:
+            section_scores.clear()
         return {
             'overall_score': 0,
             'overall_max_score': STANDARD_TOTAL_MAX_POINTS,
@@ -233,284 +445,356 @@ def calculate_store_score(store_id: str) -> Dict[str, Any]:
             'overall_color': 'red',
             'sections_completed': 0,
             'total_sections': 5,
-            'section_scores': {},
             'normalized': True
         }
 
+# Initialize cache when the blueprint is registered
+@assessment_bp.record_once
+def on_register(state):
+    cache.init_app(state.app)
+
 @assessment_bp.route('/save_response', methods=['POST'])
+@json_errors('saving response')
 def save_response():
     """Save a single assessment response with improved error handling"""
-    try:
-        # Get JSON data from request
-        data = request.get_json()
-        
-        if not data:
+    # Get JSON data from request
+    data = parse_json_body()
+    
+    if not data or not isinstance(data, dict):
+        return jsonify({
+            'success': False,
+            'error': 'No JSON data provided'
+        }), 400
+    
+    # Validate required fields
+    missing_fields = SAVE_REQUIRED_FIELDS.difference(data)
+    if missing_fields:
+        return jsonify({
+            'success': False,
+            'error': f'Missing required fields: {", ".join(sorted(missing_fields))}'
+        }), 400
+    
+    store_id = str(data['store'])
+    section_id = str(data['section'])
+    question_id = str(data['question_id'])
+    procedure_index = str(data['procedure_index'])
+    response = data['response']
+    
+    # Validate store and section IDs
+    if not store_id or store_id == 'undefined':
+        return jsonify({
+            'success': False,
+            'error': 'Invalid store ID'
+        }), 400
+    
+    if not section_id or section_id == 'undefined':
+        return jsonify({
+            'success': False,
+            'error': 'Invalid section ID'
+        }), 400
+    
+    # Create response key
+    response_key = f"{question_id}-{procedure_index}"
+    
+    # One timestamp for both the stored response and the reply
+    timestamp = datetime.utcnow().isoformat()
+    
+    # Wrap object responses with their save timestamp
+    if isinstance(response, dict):
+        response = ResponseRecord.from_payload(response, timestamp)
+    
+    # Save the response and update the indexes and counters together
+    with store_lock(store_id):
+        section_keys = ensure_storage_structure(store_id, section_id)
+        section_keys.add(response_key)
+        store_response(store_id, section_id, response_key, response)
+    invalidate_cached_scores(store_id, section_id)
+    evict_cold_stores()
+    
+    logger.info("Saved response for %s-%s-%s", store_id, section_id, response_key)
+    
+    # Calculate updated scores
+    section_score = calculate_section_score(store_id, section_id)
+    
+    # Clients that already hold the section state can ask for just the headline numbers
+    if request.args.get('minimal') in ('1', 'true'):
+        store_summary = calculate_store_summary(store_id)
+        return jsonify({
+            'success': True,
+            'section_percentage': section_score['percentage'],
+            'section_color': section_score['color'],
+            'overall_percentage': store_summary['overall_percentage'],
+            'overall_color': store_summary['overall_color']
+        })
+    
+    store_score = calculate_store_score(store_id)
+    
+    # Return JSON response with updated scores
+    return jsonify({
+        'success': True,
+        'message': 'Response saved successfully',
+        'store': store_id,
+        'section': section_id,
+        'question_id': question_id,
+        'procedure_index': procedure_index,
+        'timestamp': timestamp,
+        'section_score': section_score,
+        'store_score': store_score
+    })
+
+@assessment_bp.route('/save_responses', methods=['POST'])
+@json_errors('saving responses')
+def save_responses():
+    """Save a batch of assessment responses, scoring each touched section once"""
+    # Get JSON data from request
+    data = parse_json_body()
+    
+    if not isinstance(data, dict) or not isinstance(data.get('responses'), list):
+        return jsonify({
+            'success': False,
+            'error': 'JSON body must contain a responses list'
+        }), 400
+    
+    # Validate every item up front and group them by (store, section)
+    groups = defaultdict(list)
+    for index, item in enumerate(data['responses']):
+        if not isinstance(item, dict):
             return jsonify({
                 'success': False,
-                'error': 'No JSON data provided'
+                'error': f'Response {index} is not an object'
             }), 400
         
-        # Validate required fields
-        required_fields = ['store', 'section', 'question_id', 'procedure_index', 'response']
-        for field in required_fields:
-            if field not in data:
-                return jsonify({
-                    'success': False,
-                    'error': f'Missing required field: {field}'
-                }), 400
-        
-        store_id = str(data['store'])
-        section_id = str(data['section'])
-        question_id = str(data['question_id'])
-        procedure_index = str(data['procedure_index'])
-        response = data['response']
+        missing_fields = SAVE_REQUIRED_FIELDS.difference(item)
+        if missing_fields:
+            return jsonify({
+                'success': False,
+                'error': f'Missing required fields in response {index}: {", ".join(sorted(missing_fields))}'
+            }), 400
         
-        # Validate store and section IDs
+        store_id = str(item['store'])
+        section_id = str(item['section'])
         if not store_id or store_id == 'undefined':
             return jsonify({
                 'success': False,
-                'error': 'Invalid store ID'
+                'error': f'Invalid store ID in response {index}'
             }), 400
         
         if not section_id or section_id == 'undefined':
             return jsonify({
                 'success': False,
-                'error': 'Invalid section ID'
+                'error': f'Invalid section ID in response {index}'
             }), 400
         
-        # Ensure storage structure exists
-        ensure_storage_structure(store_id, section_id)
-        
-        # Create response key
-        response_key = f"{question_id}-{procedure_index}"
-        
-        # Add timestamp to response
-        if isinstance(response, dict):
-            response['saved_timestamp'] = datetime.utcnow().isoformat()
-        
-        # Save the response
-        responses_storage[store_id][section_id][response_key] = response
-        
-        logger.info(f"Saved response for {store_id}-{section_id}-{response_key}")
-        
-        # Calculate updated scores
-        section_score = calculate_section_score(store_id, section_id)
-        store_score = calculate_store_score(store_id)
-        
-        # Return JSON response with updated scores
-        return jsonify({
-            'success': True,
-            'message': 'Response saved successfully',
-            'store': store_id,
-            'section': section_id,
-            'question_id': question_id,
-            'procedure_index': procedure_index,
-            'timestamp': datetime.utcnow().isoformat(),
-            'section_score': section_score,
-            'store_score': store_score
-        })
-        
-    except Exception as e:
-        logger.error(f"Error saving response: {e}")
-        # Return JSON error response
-        return jsonify({
-            'success': False,
-            'error': 'Internal server error while saving response',
-            'details': str(e)
-        }), 500
+        response_key = f"{item['question_id']}-{item['procedure_index']}"
+        groups[(store_id, section_id)].append((response_key, item['response']))
+    
+    timestamp = datetime.utcnow().isoformat()
+    
+    # One lock acquisition and one cache invalidation per (store, section) group
+    for (store_id, section_id), items in groups.items():
+        with store_lock(store_id):
+            section_keys = ensure_storage_structure(store_id, section_id)
+            for response_key, response in items:
+                if isinstance(response, dict):
+                    response = ResponseRecord.from_payload(response, timestamp)
+                section_keys.add(response_key)
+                store_response(store_id, section_id, response_key, response)
+        invalidate_cached_scores(store_id, section_id)
+    evict_cold_stores()
+    
+    logger.info("Batch saved %s responses across %s sections", len(data['responses']), len(groups))
+    
+    # Score each touched section and store exactly once
+    section_scores: Dict[str, Dict[str, Any]] = {}
+    for store_id, section_id in groups:
+        section_scores.setdefault(store_id, {})[section_id] = calculate_section_score(store_id, section_id)
+    store_scores = {store_id: calculate_store_score(store_id) for store_id in section_scores}
+    
+    return jsonify({
+        'success': True,
+        'message': 'Responses saved successfully',
+        'saved_count': len(data['responses']),
+        'timestamp': timestamp,
+        'section_scores': section_scores,
+        'store_scores': store_scores
+    })
 
 @assessment_bp.route('/get_responses/<store>/<section>', methods=['GET'])
+@json_errors('getting responses')
 def get_responses(store, section):
     """Get all responses for a specific store and section with improved error handling"""
-    try:
-        store_id = str(store)
-        section_id = str(section)
-        
-        # Validate store and section IDs
-        if not store_id or store_id == 'undefined':
-            return jsonify({
-                'success': False,
-                'error': 'Invalid store ID'
-            }), 400
-        
-        if not section_id or section_id == 'undefined':
-            return jsonify({
-                'success': False,
-                'error': 'Invalid section ID'
-            }), 400
-        
-        # Get responses from storage
-        if store_id in responses_storage and section_id in responses_storage[store_id]:
-            responses = responses_storage[store_id][section_id]
-        else:
-            responses = {}
-        
-        logger.info(f"Retrieved {len(responses)} responses for {store_id}-{section_id}")
-        
-        # Calculate section score
-        section_score = calculate_section_score(store_id, section_id)
-        
-        # Return JSON response with section score
+    store_id = str(store)
+    section_id = str(section)
+    
+    # Validate store and section IDs
+    if not store_id or store_id == 'undefined':
         return jsonify({
-            'success': True,
-            'store': store_id,
-            'section': section_id,
-            'responses': responses,
-            'count': len(responses),
-            'section_score': section_score,
-            'timestamp': datetime.utcnow().isoformat()
-        })
-        
-    except Exception as e:
-        logger.error(f"Error getting responses: {e}")
-        # Return JSON error response
+            'success': False,
+            'error': 'Invalid store ID'
+        }), 400
+    
+    if not section_id or section_id == 'undefined':
         return jsonify({
             'success': False,
-            'error': 'Internal server error while getting responses',
-            'details': str(e)
-        }), 500
+            'error': 'Invalid section ID'
+        }), 400
+    
+    # Get responses from storage
+    responses = get_section_responses(store_id, section_id)
+    
+    logger.info("Retrieved %s responses for %s-%s", len(responses), store_id, section_id)
+    
+    # Calculate section score
+    section_score = calculate_section_score(store_id, section_id)
+    
+    # Return JSON response with section score
+    return jsonify({
+        'success': True,
+        'store': store_id,
+        'section': section_id,
+        'responses': responses,
+        'count': len(responses),
+        'section_score': section_score,
+        'timestamp': datetime.utcnow().isoformat()
+    })
 
 @assessment_bp.route('/get_store_score/<store>', methods=['GET'])
+@json_errors('getting store score')
 def get_store_score(store):
-    """Get normalized overall score for a store"""
-    try:
-        store_id = str(store)
-        
-        # Validate store ID
-        if not store_id or store_id == 'undefined':
-            return jsonify({
-                'success': False,
-                'error': 'Invalid store ID'
-            }), 400
-        
-        # Calculate store score with normalization
-        score = calculate_store_score(store_id)
-        
-        logger.info(f"Calculated store score for {store_id}: {score['overall_percentage']}%")
-        
-        # Return JSON response with normalized score
-        return jsonify({
-            'success': True,
-            'store': store_id,
-            'score': score,
-            'timestamp': datetime.utcnow().isoformat()
-        })
-        
-    except Exception as e:
-        logger.error(f"Error getting store score: {e}")
-        # Return JSON error response
+    """Get normalized overall score for a store, answering 304 while it is unchanged"""
+    etag = store_etag(str(store))
+    if request.if_none_match.contains_weak(etag):
+        response = Response(status=304)
+        response.set_etag(etag, weak=True)
+        return response
+    
+    response = make_response(store_score_response(store))
+    if response.status_code == 200:
+        response.set_etag(etag, weak=True)
+    return response
+
+# The cache key carries the ETag, so a write moves readers to a fresh entry and a
+# cached body can never be paired with a newer ETag
+@cache.cached(timeout=5, key_prefix=lambda: f'store_score_{request.view_args["store"]}_{store_etag(str(request.view_args["store"]))}')
+def store_score_response(store):
+    """Build the store score response"""
+    store_id = str(store)
+    
+    # Validate store ID
+    if not store_id or store_id == 'undefined':
         return jsonify({
             'success': False,
-            'error': 'Internal server error while getting store score',
-            'details': str(e)
-        }), 500
+            'error': 'Invalid store ID'
+        }), 400
+    
+    # Calculate store score with normalization
+    score = calculate_store_score(store_id)
+    
+    logger.info("Calculated store score for %s: %s%%", store_id, score['overall_percentage'])
+    
+    # Return JSON response with normalized score
+    return jsonify({
+        'success': True,
+        'store': store_id,
+        'score': score,
+        'timestamp': datetime.utcnow().isoformat()
+    })
 
 @assessment_bp.route('/get_section_score/<store>/<section>', methods=['GET'])
+@json_errors('getting section score')
+@cache.cached(timeout=5, key_prefix=lambda: f'section_score_{request.view_args["store"]}_{request.view_args["section"]}')
 def get_section_score(store, section):
     """Get normalized score for a specific section"""
-    try:
-        store_id = str(store)
-        section_id = str(section)
-        
-        # Validate store and section IDs
-        if not store_id or store_id == 'undefined':
-            return jsonify({
-                'success': False,
-                'error': 'Invalid store ID'
-            }), 400
-        
-        if not section_id or section_id == 'undefined':
-            return jsonify({
-                'success': False,
-                'error': 'Invalid section ID'
-            }), 400
-        
-        # Calculate section score with normalization
-        score = calculate_section_score(store_id, section_id)
-        
-        logger.info(f"Calculated section score for {store_id}-{section_id}: {score['percentage']}%")
-        
-        # Return JSON response with normalized score
+    store_id = str(store)
+    section_id = str(section)
+    
+    # Validate store and section IDs
+    if not store_id or store_id == 'undefined':
         return jsonify({
-            'success': True,
-            'store': store_id,
-            'section': section_id,
-            'score': score,
-            'timestamp': datetime.utcnow().isoformat()
-        })
-        
-    except Exception as e:
-        logger.error(f"Error getting section score: {e}")
-        # Return JSON error response
+            'success': False,
+            'error': 'Invalid store ID'
+        }), 400
+    
+    if not section_id or section_id == 'undefined':
         return jsonify({
             'success': False,
-            'error': 'Internal server error while getting section score',
-            'details': str(e)
-        }), 500
+            'error': 'Invalid section ID'
+        }), 400
+    
+    # Calculate section score with normalization
+    score = calculate_section_score(store_id, section_id)
+    
+    logger.info("Calculated section score for %s-%s: %s%%", store_id, section_id, score['percentage'])
+    
+    # Return JSON response with normalized score
+    return jsonify({
+        'success': True,
+        'store': store_id,
+        'section': section_id,
+        'score': score,
+        'timestamp': datetime.utcnow().isoformat()
+    })
 
 @assessment_bp.route('/refresh_scores/<store>/<section>', methods=['POST'])
+@json_errors('refreshing scores')
 def refresh_scores(store, section):
     """Force refresh of scores for a store or section"""
-    try:
-        store_id = str(store)
-        section_id = str(section)
+    store_id = str(store)
+    section_id = str(section)
+    
+    # Validate store ID
+    if not store_id or store_id == 'undefined':
+        return jsonify({
+            'success': False,
+            'error': 'Invalid store ID'
+        }), 400
+    
+    # Refresh all sections if section is 'all'
+    if section_id == 'all':
+        with store_lock(store_id):
+            store_sections = list(store_index.get(store_id, ()))
+            for cached_section in store_sections:
+                bump_section_version(store_id, cached_section)
+        for cached_section in store_sections:
+            invalidate_cached_scores(store_id, cached_section)
+        score = calculate_store_summary(store_id)
+        logger.info("Refreshed all scores for store %s", store_id)
         
-        # Validate store ID
-        if not store_id or store_id == 'undefined':
-            return jsonify({
-                'success': False,
-                'error': 'Invalid store ID'
-            }), 400
+        return jsonify({
+            'success': True,
+            'store': store_id,
+            'score': score,
+            'message': 'All scores refreshed successfully',
+            'timestamp': datetime.utcnow().isoformat()
+        })
+    else:
+        # Refresh specific section
+        with store_lock(store_id):
+            if (store_id, section_id) in section_index:
+                bump_section_version(store_id, section_id)
+        invalidate_cached_scores(store_id, section_id)
+        section_score = calculate_section_score(store_id, section_id)
+        store_score = calculate_store_score(store_id)
         
-        # Refresh all sections if section is 'all'
-        if section_id == 'all':
-            score = calculate_store_score(store_id)
-            logger.info(f"Refreshed all scores for store {store_id}")
-            
-            return jsonify({
-                'success': True,
-                'store': store_id,
-                'score': score,
-                'message': 'All scores refreshed successfully',
-                'timestamp': datetime.utcnow().isoformat()
-            })
-        else:
-            # Refresh specific section
-            section_score = calculate_section_score(store_id, section_id)
-            store_score = calculate_store_score(store_id)
-            
-            logger.info(f"Refreshed scores for {store_id}-{section_id}")
-            
-            return jsonify({
-                'success': True,
-                'store': store_id,
-                'section': section_id,
-                'section_score': section_score,
-                'store_score': store_score,
-                'message': 'Section score refreshed successfully',
-                'timestamp': datetime.utcnow().isoformat()
-            })
+        logger.info("Refreshed scores for %s-%s", store_id, section_id)
         
-    except Exception as e:
-        logger.error(f"Error refreshing scores: {e}")
-        # Return JSON error response
         return jsonify({
-            'success': False,
-            'error': 'Internal server error while refreshing scores',
-            'details': str(e)
-        }), 500
+            'success': True,
+            'store': store_id,
+            'section': section_id,
+            'section_score': section_score,
+            'store_score': store_score,
+            'message': 'Section score refreshed successfully',
+            'timestamp': datetime.utcnow().isoformat()
+        })
 
 @assessment_bp.route('/health', methods=['GET'])
 def health_check():
     """Enhanced health check endpoint with storage stats"""
     try:
         # Get storage stats
-        store_count = len(responses_storage)
-        total_responses = sum(
-            len(section_data)
-            for store_data in responses_storage.values()
-            for section_data in store_data.values()
-        )
+        store_count = len(store_index)
+        total_responses = len(responses_storage)
         
         return jsonify({
             'success': True,
@@ -524,7 +808,7 @@ def health_check():
             }
         })
     except Exception as e:
-        logger.error(f"Health check error: {e}")
+        logger.error("Health check error: %s", e)
         return jsonify({
             'success': False,
             'status': 'unhealthy',
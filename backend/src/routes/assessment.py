@@ -3,25 +3,36 @@ OSR Assessment API Routes
 Optimized version with caching and enhanced error handling
 """
 
-from flask import Blueprint, request, jsonify, current_app
+from flask import Blueprint, Response, request, jsonify, current_app, g
 from flask_caching import Cache
-import json
+import orjson
 import os
 import logging
-import traceback
+import threading
+import uuid
 from datetime import datetime
-from typing import Dict, Any, Optional
-from functools import wraps
+from typing import Dict, Any, Optional, Tuple
+from werkzeug.exceptions import HTTPException
 
 # Create the blueprint
 assessment_bp = Blueprint('assessment', __name__)
 
-# Initialize caching
-cache = Cache(config={
-    'CACHE_TYPE': 'SimpleCache',  # In-memory cache
-    'CACHE_DEFAULT_TIMEOUT': 300,  # 5 minutes
-    'CACHE_THRESHOLD': 1000  # Maximum number of items
-})
+# Initialize caching; use Redis when available so cache reads and writes do not
+# contend on an in-process lock, otherwise fall back to the in-memory SimpleCache
+REDIS_URL = os.environ.get('REDIS_URL')
+if REDIS_URL:
+    cache = Cache(config={
+        'CACHE_TYPE': 'RedisCache',
+        'CACHE_REDIS_URL': REDIS_URL,
+        'CACHE_KEY_PREFIX': 'osr_assessment_',
+        'CACHE_DEFAULT_TIMEOUT': 300  # 5 minutes
+    })
+else:
+    cache = Cache(config={
+        'CACHE_TYPE': 'SimpleCache',  # In-memory cache
+        'CACHE_DEFAULT_TIMEOUT': 300,  # 5 minutes
+        'CACHE_THRESHOLD': 1000  # Maximum number of items
+    })
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -30,90 +41,155 @@ logger = logging.getLogger(__name__)
 # Structure: {store_id: {section_id: {question_id-procedure_index: response}}}
 responses_storage: Dict[str, Dict[str, Dict[str, Any]]] = {}
 
-# Error handling decorator
-def handle_errors(f):
-    @wraps(f)
-    def decorated_function(*args, **kwargs):
-        try:
-            return f(*args, **kwargs)
-        except Exception as e:
-            # Log the full exception with traceback
-            logger.error(f"Error in {f.__name__}: {str(e)}")
-            logger.error(traceback.format_exc())
-            
-            # Return a JSON error response
-            return jsonify({
-                'success': False,
-                'error': 'Internal server error',
-                'message': str(e) if current_app.debug else 'An unexpected error occurred',
-                'endpoint': request.path,
-                'timestamp': datetime.utcnow().isoformat()
-            }), 500
-    return decorated_function
+# Aggregate counters maintained at write time so scores never rescan responses
+# Structure: {store_id: {section_id: {'positive': int, 'total': int}}}
+response_counters: Dict[str, Dict[str, Dict[str, int]]] = {}
+
+# Cache version per store; bumping it makes every cached entry for the store unreachable
+store_versions: Dict[str, int] = {}
+
+# Per-process cache namespace. Storage and versions live in process memory, so a
+# shared (Redis) cache must never serve entries written by another worker or by
+# this worker before a restart; forked workers get a fresh namespace
+cache_generation = uuid.uuid4().hex[:8]
+
+def _reset_cache_generation() -> None:
+    global cache_generation
+    cache_generation = uuid.uuid4().hex[:8]
+
+os.register_at_fork(after_in_child=_reset_cache_generation)
+
+# Serializes writes so storage and counters are updated together
+storage_lock = threading.Lock()
+
+# Sections that make up a store score and their standard max scores
+STORE_SECTIONS = ('availability', 'checkout', 'fulfillment', 'people', 'culture')
+STANDARD_SECTION_SCORES = {
+    'availability': 10,
+    'checkout': 10,
+    'fulfillment': 8,
+    'people': 10,
+    'culture': 8
+}
+STORE_MAX_SCORE = sum(STANDARD_SECTION_SCORES[section] for section in STORE_SECTIONS)
+
+# Score of a section with no responses; shared by reference, so never mutate it
+EMPTY_SECTION_SCORE = {
+    'score': 0,
+    'max_score': 10,
+    'percentage': 0,
+    'color': 'red',
+    'questions_completed': 0,
+    'total_questions': 5,
+    'normalized': True
+}
+
+# Score colors indexed by (percentage >= 80) * 2 + (percentage >= 60)
+COLOR_TABLE = ('red', 'yellow', 'yellow', 'green')
+
+# Placeholder IDs sent by clients before a store or section is selected
+INVALID_IDS = frozenset(('', 'undefined', 'null', 'None'))
+
+# Required request fields, in the order they are reported when missing
+SAVE_REQUIRED_FIELDS = ('store', 'section', 'question_id', 'procedure_index', 'response')
+BATCH_REQUIRED_FIELDS = ('store', 'section', 'responses')
+SAVE_REQUIRED_SET = frozenset(SAVE_REQUIRED_FIELDS)
+BATCH_REQUIRED_SET = frozenset(BATCH_REQUIRED_FIELDS)
+
+# Helper function to build a JSON response from pre-serialized orjson bytes
+def json_response(obj: Any, status: int = 200) -> Response:
+    """Serialize obj with orjson directly, bypassing the app's JSON provider"""
+    return Response(
+        orjson.dumps(obj, default=str, option=orjson.OPT_NON_STR_KEYS),
+        status=status,
+        mimetype='application/json'
+    )
+
+# Helper function to parse the request body without Flask's get_json machinery
+def parse_json_body() -> Any:
+    """Parse the raw request body with orjson; returns None for an empty body"""
+    body = request.get_data(cache=False)
+    return orjson.loads(body) if body else None
+
+# Helper function to coerce a request value to an ID string
+def as_id(value: Any) -> str:
+    """Return value unchanged if it is already a str, otherwise its str() form"""
+    return value if isinstance(value, str) else str(value)
 
 # Helper function to ensure store and section exist in storage
-def ensure_storage_structure(store_id: str, section_id: str) -> None:
-    """Ensure the storage structure exists for the given store and section"""
-    if store_id not in responses_storage:
-        responses_storage[store_id] = {}
-    if section_id not in responses_storage[store_id]:
-        responses_storage[store_id][section_id] = {}
+def ensure_storage_structure(store_id: str, section_id: str) -> Tuple[Dict[str, Any], Dict[str, int]]:
+    """Ensure the storage structure exists and return the section's responses and counters"""
+    section_responses = responses_storage.setdefault(store_id, {}).setdefault(section_id, {})
+    store_counters = response_counters.setdefault(store_id, {})
+    counters = store_counters.get(section_id)
+    if counters is None:
+        counters = store_counters[section_id] = {'positive': 0, 'total': 0}
+    return section_responses, counters
+
+# Helper function to invalidate cached data for a store (call with storage_lock held)
+def bump_store_version(store_id: str) -> None:
+    """Move the store to a new cache version; old entries expire via their TTL"""
+    store_versions[store_id] = store_versions.get(store_id, 0) + 1
+
+# Helper function to build a versioned cache key for the current request
+def versioned_cache_key() -> str:
+    """Build a cache key from the request URL and the store's current version"""
+    return f'view/{request.path}_v{store_versions.get(request.view_args["store"], 0)}_{cache_generation}'
+
+# Helper function to map a percentage to its score color
+def score_color(percentage: float) -> str:
+    """Return green at 80% and above, yellow at 60% and above, otherwise red"""
+    return COLOR_TABLE[(percentage >= 80) * 2 + (percentage >= 60)]
+
+# Helper function to check whether a response counts towards the score
+def is_positive_response(response: Any) -> bool:
+    """Return True if the response reports no issues"""
+    return isinstance(response, dict) and response.get('hasIssues') == 'no'
+
+# Helper function to compute a section score from its counters
+def compute_section_score(counters: Optional[Dict[str, int]]) -> Dict[str, Any]:
+    """Compute the score for a section from its counters (None if it has no data)"""
+    if counters is None:
+        return EMPTY_SECTION_SCORE
+    
+    # Simple scoring logic (can be enhanced)
+    total_responses = counters['total']
+    positive_responses = counters['positive']
+    
+    # Calculate score (2 points per positive response)
+    score = positive_responses * 2
+    max_score = total_responses * 2 if total_responses > 0 else 10
+    
+    # Normalize scores to ensure consistent max points
+    standard_max_score = 10  # Standard max score for each section
+    normalization_factor = standard_max_score / max_score if max_score > 0 else 1
+    normalized_score = score * normalization_factor
+    
+    percentage = (normalized_score / standard_max_score * 100) if standard_max_score > 0 else 0
+    
+    # Determine color based on percentage
+    color = score_color(percentage)
+    
+    return {
+        'score': round(normalized_score, 1),
+        'raw_score': score,
+        'max_score': standard_max_score,
+        'raw_max_score': max_score,
+        'percentage': round(percentage, 1),
+        'color': color,
+        'questions_completed': total_responses,
+        'total_questions': max(total_responses, 5),
+        'normalized': True
+    }
 
 # Helper function to calculate section score
 def calculate_section_score(store_id: str, section_id: str) -> Dict[str, Any]:
     """Calculate the score for a specific section"""
     try:
-        if store_id not in responses_storage or section_id not in responses_storage[store_id]:
-            return {
-                'score': 0,
-                'max_score': 10,
-                'percentage': 0,
-                'color': 'red',
-                'questions_completed': 0,
-                'total_questions': 5,
-                'normalized': True
-            }
-        
-        section_responses = responses_storage[store_id][section_id]
-        
-        # Simple scoring logic (can be enhanced)
-        total_responses = len(section_responses)
-        positive_responses = sum(1 for resp in section_responses.values() 
-                               if isinstance(resp, dict) and resp.get('hasIssues') == 'no')
-        
-        # Calculate score (2 points per positive response)
-        score = positive_responses * 2
-        max_score = total_responses * 2 if total_responses > 0 else 10
-        
-        # Normalize scores to ensure consistent max points
-        standard_max_score = 10  # Standard max score for each section
-        normalization_factor = standard_max_score / max_score if max_score > 0 else 1
-        normalized_score = score * normalization_factor
-        
-        percentage = (normalized_score / standard_max_score * 100) if standard_max_score > 0 else 0
-        
-        # Determine color based on percentage
-        if percentage >= 80:
-            color = 'green'
-        elif percentage >= 60:
-            color = 'yellow'
-        else:
-            color = 'red'
-        
-        return {
-            'score': round(normalized_score, 1),
-            'raw_score': score,
-            'max_score': standard_max_score,
-            'raw_max_score': max_score,
-            'percentage': round(percentage, 1),
-            'color': color,
-            'questions_completed': total_responses,
-            'total_questions': max(total_responses, 5),
-            'normalized': True
-        }
+        store_counters = response_counters.get(store_id)
+        return compute_section_score(store_counters.get(section_id) if store_counters else None)
     except Exception as e:
-        logger.error(f"Error calculating section score: {e}")
-        logger.error(traceback.format_exc())
+        logger.error("Error calculating section score: %s", e, exc_info=True)
         return {
             'score': 0,
             'max_score': 10,
@@ -129,7 +205,8 @@ def calculate_section_score(store_id: str, section_id: str) -> Dict[str, Any]:
 def calculate_store_score(store_id: str) -> Dict[str, Any]:
     """Calculate the overall score for a store"""
     try:
-        if store_id not in responses_storage:
+        store_counters = response_counters.get(store_id)
+        if store_counters is None:
             return {
                 'overall_score': 0,
                 'overall_max_score': 46,
@@ -141,29 +218,17 @@ def calculate_store_score(store_id: str) -> Dict[str, Any]:
                 'normalized': True
             }
         
-        store_data = responses_storage[store_id]
-        sections = ['availability', 'checkout', 'fulfillment', 'people', 'culture']
-        
         total_score = 0
-        total_max_score = 0
+        total_max_score = STORE_MAX_SCORE
         sections_completed = 0
         section_scores = {}
         
-        # Standard max scores for each section
-        standard_section_scores = {
-            'availability': 10,
-            'checkout': 10,
-            'fulfillment': 8,
-            'people': 10,
-            'culture': 8
-        }
-        
-        for section in sections:
-            section_score = calculate_section_score(store_id, section)
+        # Score every section from the store's counters in a single pass
+        for section in STORE_SECTIONS:
+            section_score = compute_section_score(store_counters.get(section))
             section_scores[section] = section_score
             
             total_score += section_score['score']
-            total_max_score += standard_section_scores.get(section, 10)
             
             if section_score['questions_completed'] > 0:
                 sections_completed += 1
@@ -171,12 +236,7 @@ def calculate_store_score(store_id: str) -> Dict[str, Any]:
         overall_percentage = (total_score / total_max_score * 100) if total_max_score > 0 else 0
         
         # Determine overall color
-        if overall_percentage >= 80:
-            overall_color = 'green'
-        elif overall_percentage >= 60:
-            overall_color = 'yellow'
-        else:
-            overall_color = 'red'
+        overall_color = score_color(overall_percentage)
         
         return {
             'overall_score': round(total_score, 1),
@@ -184,13 +244,12 @@ def calculate_store_score(store_id: str) -> Dict[str, Any]:
             'overall_percentage': round(overall_percentage, 1),
             'overall_color': overall_color,
             'sections_completed': sections_completed,
-            'total_sections': len(sections),
+            'total_sections': len(STORE_SECTIONS),
             'section_scores': section_scores,
             'normalized': True
         }
     except Exception as e:
-        logger.error(f"Error calculating store score: {e}")
-        logger.error(traceback.format_exc())
+        logger.error("Error calculating store score: %s", e, exc_info=True)
         return {
             'overall_score': 0,
             'overall_max_score': 46,
@@ -209,94 +268,131 @@ def on_register(state):
     cache.init_app(state.app)
     logger.info("✅ Cache initialized for assessment blueprint")
 
+# Stamp the request time once so every timestamp in the request shares it
+@assessment_bp.before_request
+def stamp_request_time():
+    g.now_iso = datetime.utcnow().isoformat()
+
+# Blueprint-level error handler; Flask only invokes it when a view raises
+@assessment_bp.errorhandler(Exception)
+def handle_errors(e):
+    # HTTP errors (bad request, payload too large, ...) keep their status with a JSON body
+    if isinstance(e, HTTPException):
+        return jsonify({
+            'success': False,
+            'error': e.description
+        }), e.code
+    
+    # Log the full exception with traceback
+    logger.error("Error in %s: %s", request.endpoint, e, exc_info=True)
+    
+    # Return a JSON error response
+    return jsonify({
+        'success': False,
+        'error': 'Internal server error',
+        'message': str(e) if current_app.debug else 'An unexpected error occurred',
+        'endpoint': request.path,
+        'timestamp': g.now_iso
+    }), 500
+
 @assessment_bp.route('/save_response', methods=['POST'])
-@handle_errors
 def save_response():
     """Save a single assessment response with error handling"""
     # Get JSON data from request
-    data = request.get_json()
+    try:
+        data = parse_json_body()
+    except orjson.JSONDecodeError:
+        return jsonify({
+            'success': False,
+            'error': 'Invalid JSON data'
+        }), 400
     
-    if not data:
+    if not data or not isinstance(data, dict):
         return jsonify({
             'success': False,
             'error': 'No JSON data provided'
         }), 400
     
     # Validate required fields
-    required_fields = ['store', 'section', 'question_id', 'procedure_index', 'response']
-    for field in required_fields:
-        if field not in data:
-            return jsonify({
-                'success': False,
-                'error': f'Missing required field: {field}'
-            }), 400
-    
-    store_id = str(data['store'])
-    section_id = str(data['section'])
-    question_id = str(data['question_id'])
-    procedure_index = str(data['procedure_index'])
+    missing = SAVE_REQUIRED_SET.difference(data)
+    if missing:
+        field = next(f for f in SAVE_REQUIRED_FIELDS if f in missing)
+        return jsonify({
+            'success': False,
+            'error': f'Missing required field: {field}'
+        }), 400
+    
+    store_id = as_id(data['store'])
+    section_id = as_id(data['section'])
+    question_id = as_id(data['question_id'])
+    procedure_index = as_id(data['procedure_index'])
     response = data['response']
     
     # Validate store and section IDs
-    if not store_id or store_id == 'undefined':
+    if store_id in INVALID_IDS:
         return jsonify({
             'success': False,
             'error': 'Invalid store ID'
         }), 400
     
-    if not section_id or section_id == 'undefined':
+    if section_id in INVALID_IDS:
         return jsonify({
             'success': False,
             'error': 'Invalid section ID'
         }), 400
     
-    # Ensure storage structure exists
-    ensure_storage_structure(store_id, section_id)
-    
     # Create response key
     response_key = f"{question_id}-{procedure_index}"
     
     # Add timestamp to response
     if isinstance(response, dict):
-        response['saved_timestamp'] = datetime.utcnow().isoformat()
+        response['saved_timestamp'] = g.now_iso
     
-    # Save the response
-    responses_storage[store_id][section_id][response_key] = response
-    
-    logger.info(f"Saved response for {store_id}-{section_id}-{response_key}")
+    with storage_lock:
+        # Ensure storage structure exists
+        section_responses, counters = ensure_storage_structure(store_id, section_id)
+        
+        # Replace the previous answer's contribution, if any
+        if response_key in section_responses:
+            counters['positive'] -= is_positive_response(section_responses[response_key])
+        else:
+            counters['total'] += 1
+        counters['positive'] += is_positive_response(response)
+        
+        # Save the response
+        section_responses[response_key] = response
+        
+        # Invalidate cache for this store
+        bump_store_version(store_id)
     
-    # Invalidate cache for this store and section
-    cache.delete(f'store_score_{store_id}')
-    cache.delete(f'section_score_{store_id}_{section_id}')
-    cache.delete(f'responses_{store_id}_{section_id}')
+    logger.info("Saved response for %s-%s-%s", store_id, section_id, response_key)
     
     # Return JSON response
-    return jsonify({
+    return json_response({
         'success': True,
         'message': 'Response saved successfully',
         'store': store_id,
         'section': section_id,
         'question_id': question_id,
         'procedure_index': procedure_index,
-        'timestamp': datetime.utcnow().isoformat()
+        'timestamp': g.now_iso
     })
 
 @assessment_bp.route('/get_responses/<store>/<section>', methods=['GET'])
-@handle_errors
-@cache.cached(timeout=60, key_prefix=lambda: f'responses_{request.view_args["store"]}_{request.view_args["section"]}')
+@cache.cached(timeout=60, key_prefix=versioned_cache_key)
 def get_responses(store, section):
     """Get all responses for a specific store and section with caching"""
-    store_id = str(store)
-    section_id = str(section)
+    store_id = store
+    section_id = section
     
     # Validate store and section IDs
-    if not store_id or store_id == 'undefined':
+    if store_id in INVALID_IDS:
         return jsonify({
             'success': False,
             'error': 'Invalid store ID'
         }), 400
     
-    if not section_id or section_id == 'undefined':
+    if section_id in INVALID_IDS:
         return jsonify({
             'success': False,
             'error': 'Invalid section ID'
@@ -308,28 +404,27 @@ def get_responses(store, section):
     else:
         responses = {}
     
-    logger.info(f"Retrieved {len(responses)} responses for {store_id}-{section_id}")
+    logger.info("Retrieved %d responses for %s-%s", len(responses), store_id, section_id)
     
     # Return JSON response
-    return jsonify({
+    return json_response({
         'success': True,
         'store': store_id,
         'section': section_id,
         'responses': responses,
         'count': len(responses),
-        'timestamp': datetime.utcnow().isoformat(),
+        'timestamp': g.now_iso,
         'cached': True
     })
 
 @assessment_bp.route('/get_store_score/<store>', methods=['GET'])
-@handle_errors
-@cache.cached(timeout=60, key_prefix=lambda: f'store_score_{request.view_args["store"]}')
+@cache.cached(timeout=60, key_prefix=versioned_cache_key)
 def get_store_score(store):
     """Get overall score for a store with caching"""
-    store_id = str(store)
+    store_id = store
     
     # Validate store ID
-    if not store_id or store_id == 'undefined':
+    if store_id in INVALID_IDS:
         return jsonify({
             'success': False,
             'error': 'Invalid store ID'
@@ -338,33 +433,32 @@ def get_store_score(store):
     # Calculate store score
     score = calculate_store_score(store_id)
     
-    logger.info(f"Calculated store score for {store_id}: {score['overall_percentage']}%")
+    logger.info("Calculated store score for %s: %s%%", store_id, score['overall_percentage'])
     
     # Return JSON response
-    return jsonify({
+    return json_response({
         'success': True,
         'store': store_id,
         'score': score,
-        'timestamp': datetime.utcnow().isoformat(),
+        'timestamp': g.now_iso,
         'cached': True
     })
 
 @assessment_bp.route('/get_section_score/<store>/<section>', methods=['GET'])
-@handle_errors
-@cache.cached(timeout=60, key_prefix=lambda: f'section_score_{request.view_args["store"]}_{request.view_args["section"]}')
+@cache.cached(timeout=60, key_prefix=versioned_cache_key)
 def get_section_score(store, section):
     """Get score for a specific section with caching"""
-    store_id = str(store)
-    section_id = str(section)
+    store_id = store
+    section_id = section
     
     # Validate store and section IDs
-    if not store_id or store_id == 'undefined':
+    if store_id in INVALID_IDS:
         return jsonify({
             'success': False,
             'error': 'Invalid store ID'
         }), 400
     
-    if not section_id or section_id == 'undefined':
+    if section_id in INVALID_IDS:
         return jsonify({
             'success': False,
             'error': 'Invalid section ID'
@@ -373,7 +467,7 @@ def get_section_score(store, section):
     # Calculate section score
     score = calculate_section_score(store_id, section_id)
     
-    logger.info(f"Calculated section score for {store_id}-{section_id}: {score['percentage']}%")
+    logger.info("Calculated section score for %s-%s: %s%%", store_id, section_id, score['percentage'])
     
     # Return JSON response
     return jsonify({
@@ -381,111 +475,125 @@ def get_section_score(store, section):
         'store': store_id,
         'section': section_id,
         'score': score,
-        'timestamp': datetime.utcnow().isoformat(),
+        'timestamp': g.now_iso,
         'cached': True
     })
 
 @assessment_bp.route('/batch_save_responses', methods=['POST'])
-@handle_errors
 def batch_save_responses():
     """Save multiple responses at once with error handling"""
     # Get JSON data from request
-    data = request.get_json()
+    try:
+        data = parse_json_body()
+    except orjson.JSONDecodeError:
+        return jsonify({
+            'success': False,
+            'error': 'Invalid JSON data'
+        }), 400
     
-    if not data:
+    if not data or not isinstance(data, dict):
         return jsonify({
             'success': False,
             'error': 'No JSON data provided'
         }), 400
     
     # Validate required fields
-    required_fields = ['store', 'section', 'responses']
-    for field in required_fields:
-        if field not in data:
-            return jsonify({
-                'success': False,
-                'error': f'Missing required field: {field}'
-            }), 400
-    
-    store_id = str(data['store'])
-    section_id = str(data['section'])
+    missing = BATCH_REQUIRED_SET.difference(data)
+    if missing:
+        field = next(f for f in BATCH_REQUIRED_FIELDS if f in missing)
+        return jsonify({
+            'success': False,
+            'error': f'Missing required field: {field}'
+        }), 400
+    
+    store_id = as_id(data['store'])
+    section_id = as_id(data['section'])
     responses = data['responses']
     
     # Validate store and section IDs
-    if not store_id or store_id == 'undefined':
+    if store_id in INVALID_IDS:
         return jsonify({
             'success': False,
             'error': 'Invalid store ID'
         }), 400
     
-    if not section_id or section_id == 'undefined':
+    if section_id in INVALID_IDS:
         return jsonify({
             'success': False,
             'error': 'Invalid section ID'
         }), 400
     
-    # Ensure storage structure exists
-    ensure_storage_structure(store_id, section_id)
+    # Validate responses before touching storage
+    if not isinstance(responses, dict):
+        return jsonify({
+            'success': False,
+            'error': 'Invalid responses data'
+        }), 400
     
-    # Save all responses
-    saved_count = 0
-    for response_key, response in responses.items():
-        if isinstance(response, dict):
-            response['saved_timestamp'] = datetime.utcnow().isoformat()
+    with storage_lock:
+        # Ensure storage structure exists
+        section_responses, counters = ensure_storage_structure(store_id, section_id)
         
-        responses_storage[store_id][section_id][response_key] = response
-        saved_count += 1
-    
-    logger.info(f"Batch saved {saved_count} responses for {store_id}-{section_id}")
+        # Save all responses, accumulating counter deltas locally
+        saved_count = 0
+        positive_delta = 0
+        total_delta = 0
+        now_iso = g.now_iso
+        for response_key, response in responses.items():
+            if isinstance(response, dict):
+                response['saved_timestamp'] = now_iso
+            
+            if response_key in section_responses:
+                positive_delta -= is_positive_response(section_responses[response_key])
+            else:
+                total_delta += 1
+            positive_delta += is_positive_response(response)
+            
+            section_responses[response_key] = response
+            saved_count += 1
+        
+        counters['positive'] += positive_delta
+        counters['total'] += total_delta
+        
+        # Invalidate cache for this store
+        bump_store_version(store_id)
     
-    # Invalidate cache for this store and section
-    cache.delete(f'store_score_{store_id}')
-    cache.delete(f'section_score_{store_id}_{section_id}')
-    cache.delete(f'responses_{store_id}_{section_id}')
+    logger.info("Batch saved %d responses for %s-%s", saved_count, store_id, section_id)
     
     # Return JSON response
-    return jsonify({
+    return json_response({
         'success': True,
         'message': f'Batch saved {saved_count} responses successfully',
         'store': store_id,
         'section': section_id,
         'saved_count': saved_count,
-        'timestamp': datetime.utcnow().isoformat()
+        'timestamp': g.now_iso
     })
 
 @assessment_bp.route('/refresh_scores/<store>/<section>', methods=['POST'])
-@handle_errors
 def refresh_scores(store, section):
     """Refresh scores for a store/section and invalidate cache"""
-    store_id = str(store)
-    section_id = str(section) if section != 'all' else None
+    store_id = store
+    section_id = section if section != 'all' else None
     
     # Validate store ID
-    if not store_id or store_id == 'undefined':
+    if store_id in INVALID_IDS:
         return jsonify({
             'success': False,
             'error': 'Invalid store ID'
         }), 400
     
-    # Invalidate cache
-    cache.delete(f'store_score_{store_id}')
-    if section_id:
-        cache.delete(f'section_score_{store_id}_{section_id}')
-        cache.delete(f'responses_{store_id}_{section_id}')
-    else:
-        # If section is 'all', invalidate cache for all sections
-        sections = ['availability', 'checkout', 'fulfillment', 'people', 'culture']
-        for sec in sections:
-            cache.delete(f'section_score_{store_id}_{sec}')
-            cache.delete(f'responses_{store_id}_{sec}')
+    # Invalidate cache for the whole store (covers a single section or 'all')
+    with storage_lock:
+        bump_store_version(store_id)
     
     # Recalculate scores (they're calculated on-demand, so this is mainly for logging)
     if section_id:
         score = calculate_section_score(store_id, section_id)
-        logger.info(f"Refreshed section score for {store_id}-{section_id}: {score['percentage']}%")
+        logger.info("Refreshed section score for %s-%s: %s%%", store_id, section_id, score['percentage'])
     else:
         score = calculate_store_score(store_id)
-        logger.info(f"Refreshed store score for {store_id}: {score['overall_percentage']}%")
+        logger.info("Refreshed store score for %s: %s%%", store_id, score['overall_percentage'])
     
     # Return JSON response
     return jsonify({
@@ -493,45 +601,42 @@ def refresh_scores(store, section):
         'message': 'Scores refreshed successfully',
         'store': store_id,
         'section': section_id,
-        'timestamp': datetime.utcnow().isoformat(),
+        'timestamp': g.now_iso,
         'cache_invalidated': True
     })
 
 # Debug endpoint to view all stored data
 @assessment_bp.route('/debug/storage', methods=['GET'])
-@handle_errors
 def debug_storage():
     """Debug endpoint to view all stored data"""
     # Return JSON response
-    return jsonify({
+    return json_response({
         'success': True,
         'storage': responses_storage,
         'stores_count': len(responses_storage),
-        'timestamp': datetime.utcnow().isoformat()
+        'timestamp': g.now_iso
     })
 
 # Debug endpoint to view cache stats
 @assessment_bp.route('/debug/cache', methods=['GET'])
-@handle_errors
 def debug_cache():
     """Debug endpoint to view cache statistics"""
     # Get cache statistics
     cache_stats = {
         'cache_type': cache.config['CACHE_TYPE'],
         'cache_timeout': cache.config['CACHE_DEFAULT_TIMEOUT'],
-        'cache_threshold': cache.config['CACHE_THRESHOLD']
+        'cache_threshold': cache.config.get('CACHE_THRESHOLD')
     }
     
     # Return JSON response
     return jsonify({
         'success': True,
         'cache_stats': cache_stats,
-        'timestamp': datetime.utcnow().isoformat()
+        'timestamp': g.now_iso
     })
 
 # Debug endpoint to clear cache
 @assessment_bp.route('/debug/clear_cache', methods=['POST'])
-@handle_errors
 def clear_cache():
     """Debug endpoint to clear the cache"""
     # Clear the cache
@@ -541,6 +646,6 @@ def clear_cache():
     return jsonify({
         'success': True,
         'message': 'Cache cleared successfully',
-        'timestamp': datetime.utcnow().isoformat()
+        'timestamp': g.now_iso
     })
 